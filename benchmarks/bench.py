@@ -0,0 +1,243 @@
+"""Benchmark the dashboard's hot paths at several dataset sizes.
+
+Times loading the processed data, the sidebar filtering done in ``main()``,
+every tab's aggregations and the plotly figure build + JSON serialization,
+reporting wall time, peak Python memory and payload bytes. Results are written
+as JSON so two commits can be compared::
+
+    python benchmarks/bench.py --sizes 14003,1000000,10000000
+    python benchmarks/bench.py --sizes 1000000 --compare benchmarks/results/<old>.json
+
+Larger sizes are resampled (with replacement) from the processed data and
+cached under ``benchmarks/data/``; pass ``--source`` to benchmark another
+processed Parquet file instead.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "streamlit_app"))
+
+import pandas as pd  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+import analytics  # noqa: E402
+import figures  # noqa: E402
+from analytics import FilterSpec, cache, data as data_module  # noqa: E402
+
+DATA_DIR = ROOT / "benchmarks" / "data"
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+DEFAULT_SIZES = [14003, 1_000_000, 10_000_000]
+
+# Filter states exercised per size: the default view plus the common sidebar selections
+SPECS = {
+    "all": FilterSpec(),
+    "gender": FilterSpec(gender="Female"),
+    "learning_style": FilterSpec(learning_style="Visual"),
+    "attendance": FilterSpec(attendance=(75.0, 95.0)),
+    "combined": FilterSpec(gender="Male", learning_style="Kinesthetic", attendance=(70.0, 90.0)),
+}
+
+# Each tab's aggregations, called through ``.uncached`` so every repeat does the work
+AGGREGATES = {
+    "overview": [
+        ("overview_kpis", ()),
+        ("exam_score_histogram", ()),
+        ("performance_counts", ()),
+        ("learning_style_counts", ()),
+    ],
+    "attendance_study": [
+        ("scatter_density", ("Attendance",)),
+        ("attendance_trendlines", ()),
+        ("score_by_attendance_bucket", ()),
+        ("score_by_study_hours", ()),
+    ],
+    "learning_style": [
+        ("score_by_learning_style", ()),
+        ("performance_by_learning_style", ()),
+        ("engagement_by_learning_style", ("StudyHours",)),
+    ],
+    "stress_motivation": [
+        ("scatter_density", ("StressLevel",)),
+        ("scatter_density", ("Motivation",)),
+        ("stress_motivation_summary", ()),
+    ],
+    "drivers": [
+        ("correlation_matrix", ()),
+        ("driver_effects", ("ExamScore",)),
+    ],
+    "drilldown": [
+        ("drill_down", ("PerformanceCategory", "High")),
+        ("drill_down", ("AttendanceBucket", "Good (75–89%)", "Age", False, 100)),
+    ],
+}
+
+FIGURES = [
+    ("overview", figures.exam_histogram_figure, ()),
+    ("overview", figures.performance_figure, ()),
+    ("overview", figures.learning_style_pie_figure, ()),
+    ("attendance_study", figures.attendance_scatter_figure, ()),
+    ("attendance_study", figures.attendance_bucket_figure, ()),
+    ("attendance_study", figures.study_hours_figure, ()),
+    ("learning_style", figures.learning_style_score_figure, ()),
+    ("learning_style", figures.learning_style_performance_figure, ()),
+    ("learning_style", figures.engagement_figure, ("StudyHours",)),
+    ("stress_motivation", figures.stress_scatter_figure, ()),
+    ("stress_motivation", figures.motivation_scatter_figure, ()),
+    ("drivers", figures.correlation_heatmap_figure, ()),
+    ("drivers", figures.driver_effects_figure, ("ExamScore",)),
+]
+
+
+def scaled_dataset(rows: int, source: Path) -> Path:
+    """Processed Parquet file with ``rows`` rows resampled from ``source`` (cached on disk)."""
+    if rows == pq.ParquetFile(source).metadata.num_rows:
+        return source
+    path = DATA_DIR / f"{source.stem}_{rows}.parquet"
+    if not path.exists() or path.stat().st_mtime < source.stat().st_mtime:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        base = pd.read_parquet(source)
+        base.sample(n=rows, replace=True, random_state=0, ignore_index=True).to_parquet(path, index=False)
+    return path
+
+
+def measure(fn, repeat: int) -> dict:
+    """Median/min wall time over ``repeat`` runs, then one traced run for peak memory."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": statistics.median(times),
+        "seconds_min": min(times),
+        "peak_bytes": peak,
+        "result": result,
+    }
+
+
+def bench_size(rows: int, source: Path, backend: str, repeat: int) -> list:
+    path = scaled_dataset(rows, source)
+    records = []
+
+    def record(stage: str, name: str, fn, **extra):
+        stats = measure(fn, repeat)
+        payload = extra.pop("payload", None)
+        if payload is not None:
+            extra["payload_bytes"] = payload(stats["result"])
+        del stats["result"]
+        records.append({"rows": rows, "stage": stage, "name": name, **stats, **extra})
+        print(f"{rows:>11,}  {stage:<10} {name:<48} {stats['seconds'] * 1000:10.2f} ms")
+
+    def load():
+        return analytics.load_dataset(path, backend=backend)
+
+    record("load", "load_dataset", load)
+    data = load()
+    if backend == "pandas":
+        record("load", "filter_index", lambda: data_module.FilterIndex(data.frame))
+        record("load", "aggregate_cube", lambda: analytics.AggregateCube(data.frame))
+        _ = data.index, data.cube  # built once here so later stages time only the queries
+
+    record("filter", "options", data.options)
+    for label, spec in SPECS.items():
+        if backend == "pandas":
+            # Straight to the index: Dataset.positions would answer repeats from its memo
+            record("filter", f"positions[{label}]", lambda spec=spec: data.index.positions(spec))
+        else:
+            record("filter", f"count[{label}]", lambda spec=spec: data.count(spec))
+
+    for label, spec in SPECS.items():
+        for tab, calls in AGGREGATES.items():
+            for name, args in calls:
+                fn = getattr(analytics, name).uncached
+                record("aggregate", f"{tab}.{name}{list(args) or ''}[{label}]", lambda fn=fn, args=args, spec=spec: fn(data, spec, *args))
+
+    for label, spec in SPECS.items():
+        for tab, builder, args in FIGURES:
+            def build(builder=builder, args=args, spec=spec):
+                cache.RESULTS.clear()
+                return builder(data, spec, *args)
+
+            record("figure", f"{tab}.{builder.__name__}[{label}]", build)
+            fig = build()
+            record(
+                "serialize", f"{tab}.{builder.__name__}[{label}]", fig.to_json,
+                payload=lambda payload: len(payload.encode()),
+            )
+    return records
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def compare(results: list, baseline_path: Path, threshold: float) -> int:
+    """Print per-benchmark time ratios against a baseline file; returns the regression count."""
+    baseline = {
+        (r["rows"], r["stage"], r["name"]): r for r in json.loads(baseline_path.read_text())["results"]
+    }
+    regressions = 0
+    for r in results:
+        old = baseline.get((r["rows"], r["stage"], r["name"]))
+        if old is None or old["seconds"] <= 0:
+            continue
+        ratio = r["seconds"] / old["seconds"]
+        if ratio >= threshold:
+            regressions += 1
+            print(f"⚠️  {r['rows']:,} {r['stage']} {r['name']}: {old['seconds'] * 1000:.2f} -> {r['seconds'] * 1000:.2f} ms ({ratio:.2f}x)")
+    print(f"{regressions} benchmark(s) at least {threshold:.2f}x slower than {baseline_path.name}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's load, filter, aggregate and figure paths.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated row counts")
+    parser.add_argument("--source", type=Path, default=data_module.DATA_PATH, help="processed Parquet to scale from")
+    parser.add_argument("--backend", default=analytics.config.BACKEND, choices=["pandas", "duckdb"])
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--output", type=Path, default=None, help="results JSON (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    results = []
+    for rows in (int(size) for size in args.sizes.split(",")):
+        results.extend(bench_size(rows, args.source, args.backend, args.repeat))
+
+    output = args.output or RESULTS_DIR / f"{commit}-{args.backend}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "commit": commit,
+        "backend": args.backend,
+        "repeat": args.repeat,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+    }
+    output.write_text(json.dumps({"meta": meta, "results": results}, indent=1))
+    print(f"✅ Saved {len(results)} results to: {output}")
+
+    if args.compare is not None:
+        sys.exit(1 if compare(results, args.compare, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
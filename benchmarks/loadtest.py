@@ -0,0 +1,213 @@
+"""Offline load test: many simulated sessions driving ``streamlit_app/app.py`` at once.
+
+Each session is a ``streamlit.testing`` AppTest driven from its own thread, as
+sessions are inside one Streamlit server process, sharing that process's
+caches. After its first run a session repeatedly changes a random filter,
+section, engagement metric, outcome, drill-down segment or drill-down page
+(after an optional random think time) and reruns the script. For every concurrency level the tool reports rerun latency
+percentiles, throughput, errors and memory growth, and saves the results as
+JSON::
+
+    python benchmarks/loadtest.py --concurrency 1,8,32,128 --actions 20 --think 2
+
+AppTest swaps process-global runtime state on every run, so script runs are
+serialized by a lock and latencies include time queued behind other sessions.
+That models one GIL-bound server process, where concurrent reruns mostly take
+turns on a single core anyway.
+
+Runs fully offline; memory figures read ``/proc/self/status`` (Linux).
+"""
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+APP_PATH = ROOT / "streamlit_app" / "app.py"
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+sys.path.insert(0, str(APP_PATH.parent))
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import analytics  # noqa: E402
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _widget(at: AppTest, label: str):
+    return next((s for s in at.selectbox if s.label == label), None)
+
+
+def random_action(at: AppTest, rng: random.Random) -> str:
+    """Change one random input on the page (without running the script yet)."""
+    actions = ["gender", "learning_style", "attendance", "section"]
+    if _widget(at, "Choose engagement metric") is not None:
+        actions.append("metric")
+    if _widget(at, "Choose outcome") is not None:
+        actions.append("outcome")
+    if _widget(at, "Segment") is not None:
+        actions.append("segment")
+    if len(at.number_input):
+        actions.append("page")
+    action = rng.choice(actions)
+    if action == "gender":
+        box = _widget(at, "Gender")
+        box.set_value(rng.choice(box.options))
+    elif action == "learning_style":
+        box = _widget(at, "Learning Style")
+        box.set_value(rng.choice(box.options))
+    elif action == "metric":
+        box = _widget(at, "Choose engagement metric")
+        box.set_value(rng.choice(box.options))
+    elif action == "outcome":
+        box = _widget(at, "Choose outcome")
+        box.set_value(rng.choice(box.options))
+    elif action == "segment":
+        box = _widget(at, "Segment")
+        box.set_value(rng.choice(box.options))
+    elif action == "page":
+        pager = at.number_input[0]
+        pager.set_value(rng.randint(int(pager.min), int(pager.max)))
+    elif action == "section":
+        picker = at.button_group[0]
+        picker.set_value(rng.choice(picker.options))
+    else:
+        slider = at.slider[0]
+        low, high = sorted(rng.uniform(slider.min, slider.max) for _ in range(2))
+        slider.set_range(round(low), round(high))
+    if action in ("gender", "learning_style", "attendance"):
+        # Sidebar filters batched in a form only apply with its submit button
+        submit = next((b for b in at.button if b.label == "Apply filters"), None)
+        if submit is not None:
+            submit.click()
+    return action
+
+
+_run_lock = threading.Lock()
+
+
+def _timed_run(at: AppTest) -> float:
+    start = time.perf_counter()
+    with _run_lock:
+        at.run()
+    return time.perf_counter() - start
+
+
+def run_session(seed: int, actions: int, think: float, timeout: float, start: threading.Barrier) -> dict:
+    rng = random.Random(seed)
+    latencies = []
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    start.wait()
+    first = _timed_run(at)
+    errors = len(at.exception)
+    for _ in range(actions):
+        if think:
+            time.sleep(rng.expovariate(1 / think))
+        random_action(at, rng)
+        latencies.append(_timed_run(at))
+        errors += len(at.exception)
+    return {"first_run": first, "latencies": latencies, "errors": errors}
+
+
+def run_level(concurrency: int, actions: int, think: float, timeout: float, seed: int) -> dict:
+    rss_before = rss_mb()
+    start = threading.Barrier(concurrency)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        sessions = list(pool.map(
+            lambda i: run_session(seed * 100_003 + i, actions, think, timeout, start), range(concurrency)
+        ))
+    wall = time.perf_counter() - t0
+    latencies = np.array([lat for s in sessions for lat in s["latencies"]]) * 1000
+    first = np.array([s["first_run"] for s in sessions]) * 1000
+    p50, p90, p95, p99 = np.percentile(latencies, [50, 90, 95, 99]) if latencies.size else [float("nan")] * 4
+    return {
+        "concurrency": concurrency,
+        "reruns": int(latencies.size),
+        "errors": sum(s["errors"] for s in sessions),
+        "wall_seconds": wall,
+        "throughput_rps": (latencies.size + concurrency) / wall,
+        "first_run_ms_p50": float(np.median(first)),
+        "latency_ms_p50": float(p50),
+        "latency_ms_p90": float(p90),
+        "latency_ms_p95": float(p95),
+        "latency_ms_p99": float(p99),
+        "latency_ms_max": float(latencies.max()) if latencies.size else float("nan"),
+        "rss_mb_before": rss_before,
+        "rss_mb_after": rss_mb(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def clear_caches():
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    analytics.cache.DATASETS.clear()
+    analytics.cache.RESULTS.clear()
+
+
+def git_commit() -> str:
+    out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return out.stdout.strip() or "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the dashboard with concurrent simulated sessions.")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated concurrent session counts")
+    parser.add_argument("--actions", type=int, default=10, help="filter/section changes per session")
+    parser.add_argument("--think", type=float, default=0.0, help="mean seconds a user pauses between actions (0 = back to back)")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per script run")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the simulated actions")
+    parser.add_argument("--cold", action="store_true", help="clear all caches before each concurrency level")
+    parser.add_argument("--output", type=Path, default=None, help="results JSON (default: benchmarks/results/loadtest-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'rps':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'RSS MB':>13}")
+    levels = []
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        if args.cold:
+            clear_caches()
+        level = run_level(concurrency, args.actions, args.think, args.timeout, args.seed)
+        levels.append(level)
+        print(
+            f"{concurrency:>8} {level['reruns']:>7} {level['errors']:>6} {level['throughput_rps']:>7.1f} "
+            f"{level['latency_ms_p50']:>8.0f} {level['latency_ms_p90']:>8.0f} {level['latency_ms_p99']:>8.0f} "
+            f"{level['rss_mb_before']:>6.0f}→{level['rss_mb_after']:<6.0f}"
+        )
+
+    output = args.output or RESULTS_DIR / f"loadtest-{git_commit()}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "commit": git_commit(),
+        "actions": args.actions,
+        "think": args.think,
+        "cold": args.cold,
+        "seed": args.seed,
+        "backend": analytics.config.BACKEND,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    output.write_text(json.dumps({"meta": meta, "levels": levels}, indent=1))
+    print(f"✅ Saved results to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Headless analytics core behind the Student Performance dashboard.
+
+Nothing in here imports Streamlit, so the same metrics can be benchmarked,
+cached or run from batch jobs::
+
+    from analytics import FilterSpec, load_dataset, score_by_learning_style
+
+    data = load_dataset()
+    score_by_learning_style(data, FilterSpec(gender="Female"))
+"""
+from . import cache, config, timing
+from .buckets import BUCKETS, Bucket, add_buckets, categorize_buckets
+from .cube import AggregateCube
+from .cache import BoundedCache, cached_result, fingerprint
+from .data import Dataset, cached_dataset, list_cohorts, load_dataset, read_processed
+from .drilldown import SegmentIndex
+from .filters import ALL, FilterIndex, FilterSpec
+from .metrics import (
+    attendance_trendlines,
+    correlation_matrix,
+    driver_effects,
+    drill_down,
+    engagement_by_learning_style,
+    exam_score_histogram,
+    hero_snapshot,
+    learning_style_counts,
+    overview_kpis,
+    performance_by_learning_style,
+    performance_counts,
+    scatter_density,
+    scatter_points,
+    score_by_attendance_bucket,
+    score_by_learning_style,
+    score_by_study_hours,
+    stress_motivation_insights,
+    stress_motivation_summary,
+)
+from .moments import MomentCells, Moments
+from .quantiles import ValueSketch, box_summary, sketch_box_summary
+from .trend import RegressionSums
@@ -0,0 +1,74 @@
+"""Declarative bucket definitions shared by data prep and the app.
+
+Each bucket lists its lower bounds in ascending order; a value gets the label
+of the highest bound it passes. Binning is one ``np.searchsorted`` per column
+and yields ordered categoricals, so charts sort buckets low → high.
+"""
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Bucket:
+    column: str
+    source: str
+    # (bound, op) pairs, op ">=" or ">"; labels has one more entry than bounds
+    bounds: Tuple[Tuple[float, str], ...]
+    labels: Tuple[str, ...]
+
+    def edges(self) -> np.ndarray:
+        # x > b  <=>  x >= next float after b, so every bound can use side="right"
+        return np.array([b if op == ">=" else np.nextafter(b, np.inf) for b, op in self.bounds])
+
+    def categories(self) -> pd.CategoricalDtype:
+        return pd.CategoricalDtype(list(self.labels), ordered=True)
+
+    def assign(self, values: pd.Series) -> pd.Categorical:
+        x = pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64")
+        codes = np.searchsorted(self.edges(), x, side="right")
+        codes[np.isnan(x)] = 0  # missing values fall in the lowest bucket, like failed comparisons
+        return pd.Categorical.from_codes(codes, dtype=self.categories())
+
+
+BUCKETS = [
+    Bucket(
+        "PerformanceCategory", "ExamScore",
+        ((50, ">="), (80, ">=")),
+        ("Low", "Medium", "High"),
+    ),
+    Bucket(
+        "AttendanceBucket", "Attendance",
+        ((60, ">="), (75, ">="), (90, ">=")),
+        ("Low (<60%)", "Moderate (60–74%)", "Good (75–89%)", "Excellent (>=90%)"),
+    ),
+    Bucket(
+        "StudyHoursBucket", "StudyHours",
+        ((0, ">"), (10, ">="), (20, ">=")),
+        ("None", "Low (1–9 hrs)", "Moderate (10–19 hrs)", "Intensive (>=20 hrs)"),
+    ),
+    Bucket(
+        "StressBucket", "StressLevel",
+        ((4, ">="), (8, ">=")),
+        ("Low", "Medium", "High"),
+    ),
+]
+
+
+def add_buckets(df: pd.DataFrame) -> pd.DataFrame:
+    """Add every bucket column whose source column is present."""
+    df = df.copy()
+    for bucket in BUCKETS:
+        if bucket.source in df.columns:
+            df[bucket.column] = bucket.assign(df[bucket.source])
+    return df
+
+
+def categorize_buckets(df: pd.DataFrame) -> pd.DataFrame:
+    """Give already-labelled bucket columns (e.g. read back from CSV) their ordered dtype."""
+    for bucket in BUCKETS:
+        if bucket.column in df.columns:
+            df[bucket.column] = df[bucket.column].astype(bucket.categories())
+    return df
@@ -0,0 +1,210 @@
+"""Process-wide caches for loaded datasets and per-filter metric results.
+
+Entries are keyed on a fingerprint of the processed files (mtime + size, or a
+content hash), so a nightly prep that rewrites them is picked up on the next
+request without a restart, while the stale entries simply age out. Both caches
+are LRU-bounded by entry count and approximate bytes, with an optional TTL.
+"""
+import functools
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
+from pathlib import Path
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import config, timing
+
+_HASH_CHUNK = 1 << 20
+_content_hashes = {}
+
+
+def _file_hash(path: Path, stat) -> str:
+    # Hashing is only redone when mtime/size change; identical rewrites keep their key
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    digest = _content_hashes.get(key)
+    if digest is None:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_CHUNK), b""):
+                h.update(block)
+        digest = _content_hashes[key] = h.hexdigest()
+    return digest
+
+
+def fingerprint(path: Path, content_hash: Optional[bool] = None) -> tuple:
+    """Cheap identity of a file or directory tree's current contents."""
+    content_hash = config.CACHE_CONTENT_HASH if content_hash is None else content_hash
+    path = Path(path)
+    if not path.exists():
+        return (str(path), None)
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    parts = []
+    for file in files:
+        stat = file.stat()
+        if content_hash:
+            parts.append((str(file), _file_hash(file, stat)))
+        else:
+            parts.append((str(file), stat.st_mtime_ns, stat.st_size))
+    return (str(path), tuple(parts))
+
+
+def sizeof(value) -> int:
+    """Approximate in-memory size used for the byte bound."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    nbytes = getattr(value, "nbytes", None)
+    return int(nbytes) if nbytes is not None else sys.getsizeof(value)
+
+
+class BoundedCache:
+    """Thread-safe LRU cache bounded by entries and bytes, with optional TTL (seconds).
+
+    :meth:`get_or_compute` computes each missing key once: concurrent callers
+    asking for a key that is being computed wait for that result.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._pending = {}  # key -> Future of the caller computing it
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key, count=False) is not None
+
+    def _lookup(self, key: Hashable, count: bool = True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] < time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            if count:
+                if entry is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+            return entry
+
+    def get(self, key: Hashable, default=None):
+        entry = self._lookup(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key: Hashable, value, size: Optional[int] = None):
+        size = sizeof(value) if size is None else size
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, expires)
+            self.nbytes += size
+            self._evict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]):
+        while True:
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is not None:
+                    return entry[0]
+                future = self._pending.get(key)
+                computing = future is None
+                if computing:
+                    future = self._pending[key] = Future()
+            if computing:
+                break
+            try:
+                return future.result()
+            except CancelledError:
+                continue  # that computation failed: try it here
+
+        try:
+            value = compute()
+            self.put(key, value)
+        except BaseException:
+            # Waiters retry rather than receive another caller's exception
+            future.cancel()
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+        future.set_result(value)
+        return value
+
+    def pop(self, key: Hashable, default=None):
+        """Remove ``key`` and return its value (``default`` if absent)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._drop(key)
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _drop(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self.nbytes -= size
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds the byte bound
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+
+DATASETS = BoundedCache(
+    config.DATASET_CACHE_ENTRIES,
+    max_bytes=config.DATASET_CACHE_MB * 2**20 if config.DATASET_CACHE_MB else None,
+    ttl=config.DATASET_CACHE_TTL or None,
+)
+RESULTS = BoundedCache(
+    config.CACHE_MAX_ENTRIES,
+    max_bytes=config.CACHE_MAX_MB * 2**20,
+    ttl=config.CACHE_TTL or None,
+)
+
+
+def cached_result(fn):
+    """Memoize a ``metric(data, spec, *args)`` in :data:`RESULTS`.
+
+    Keyed on the dataset's fingerprint, so results for replaced data are never
+    served. Cached frames are shared between callers and must not be mutated;
+    the undecorated function stays available as ``fn.uncached``.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(data, spec, *args, **kwargs):
+        key = (fn.__qualname__, data.fingerprint, spec, args, tuple(sorted(kwargs.items())))
+        with timing.span(f"metric:{fn.__name__}", cached=key in RESULTS):
+            return RESULTS.get_or_compute(key, lambda: fn(data, spec, *args, **kwargs))
+
+    wrapper.uncached = fn
+    return wrapper
@@ -0,0 +1,67 @@
+"""Tunables, overridable through ``DASHBOARD_*`` environment variables."""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    return value.strip().lower() in ("1", "true", "yes", "on") if value else default
+
+
+# Query backend: "pandas" (in-memory frame + cube) or "duckdb" (SQL over the Parquet files)
+BACKEND = os.environ.get("DASHBOARD_BACKEND", "pandas").lower()
+# DuckDB worker threads (0 = DuckDB's default, one per core)
+DUCKDB_THREADS = _env_int("DASHBOARD_DUCKDB_THREADS", 0)
+
+# Load the pandas dataset as a read-only view of the memory-mapped Arrow file,
+# shared by every session and server process on the host
+MMAP = _env_flag("DASHBOARD_MMAP")
+
+# Scatter plots with more matching students than this are drawn from a 2D grid
+# of counts instead of one marker per student.
+SCATTER_MAX_POINTS = _env_int("DASHBOARD_SCATTER_MAX_POINTS", 5000)
+# Grid resolution (bins per axis) used by the density scatter.
+DENSITY_BINS = _env_int("DASHBOARD_DENSITY_BINS", 40)
+# Box plots over at most this many students use exact quartiles from the rows;
+# larger views are summarized from the cube's per-cell value sketches.
+BOX_EXACT_MAX_ROWS = _env_int("DASHBOARD_BOX_EXACT_MAX_ROWS", 50000)
+
+# Loaded datasets kept per (backend, cohorts, source fingerprint): entry and
+# memory bounds (0 MB = entries only). A superseded version of rewritten files
+# is dropped as soon as its replacement is loaded.
+DATASET_CACHE_ENTRIES = _env_int("DASHBOARD_DATASET_CACHE_ENTRIES", 4)
+DATASET_CACHE_MB = _env_int("DASHBOARD_DATASET_CACHE_MB", 4096)
+# Seconds before a cached dataset is reloaded even if unchanged (0 = never)
+DATASET_CACHE_TTL = _env_int("DASHBOARD_DATASET_CACHE_TTL", 0)
+# Per-filter metric results: entry and memory bounds, and expiry in seconds (0 = never)
+CACHE_MAX_ENTRIES = _env_int("DASHBOARD_CACHE_MAX_ENTRIES", 2048)
+CACHE_MAX_MB = _env_int("DASHBOARD_CACHE_MAX_MB", 256)
+CACHE_TTL = _env_int("DASHBOARD_CACHE_TTL", 3600)
+# Serialized chart figures kept per (figure, data version, filters): entries and memory bound
+FIGURE_CACHE_ENTRIES = _env_int("DASHBOARD_FIGURE_CACHE_ENTRIES", 512)
+FIGURE_CACHE_MB = _env_int("DASHBOARD_FIGURE_CACHE_MB", 128)
+# Fingerprint processed files by content hash instead of mtime + size, so a
+# prep run that rewrites identical data keeps the warm caches
+CACHE_CONTENT_HASH = _env_flag("DASHBOARD_CACHE_CONTENT_HASH")
+
+# Startup-optimized mode: chart builders (plotly.express) are imported when the first
+# chart is drawn, after the hero and metric cards have painted
+FAST_START = _env_flag("DASHBOARD_FAST_START", True)
+
+# Sidebar filters are batched in a form and applied with a button; when off they
+# apply live, and each change can first wait DASHBOARD_FILTER_DEBOUNCE_MS so a
+# burst of slider moves collapses into one rerun
+FILTER_FORM = _env_flag("DASHBOARD_FILTER_FORM", True)
+FILTER_DEBOUNCE_MS = _env_int("DASHBOARD_FILTER_DEBOUNCE_MS", 0)
+
+# Students per page in the drill-down table (only the visible page is sent to the browser)
+DRILL_PAGE_SIZE = _env_int("DASHBOARD_DRILL_PAGE_SIZE", 50)
+
+# Time each rerun's stages: a collapsible sidebar panel, plus one JSON line per
+# rerun appended to DASHBOARD_TIMING_LOG when set
+TIMING = _env_flag("DASHBOARD_TIMING")
+TIMING_LOG = os.environ.get("DASHBOARD_TIMING_LOG") or None
@@ -0,0 +1,236 @@
+"""Pre-aggregated sufficient statistics for the dashboard's bar/pie/metric numbers.
+
+The sidebar only filters on Gender, LearningStyle and an Attendance range, so
+every chart number can be answered from cells keyed by
+``Gender × LearningStyle × Attendance`` (× one grouping dimension) that hold
+``count``, ``<col>_sum`` and ``<col>_sumsq``. Answering a query sums the
+matching cells, which costs O(cells) no matter how many students are loaded.
+Values are expected to be imputed by the prep step, so ``count`` is the
+denominator for every mean.
+"""
+import abc
+import copy
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .filters import ALL, FilterSpec
+from .moments import MOMENT_COLS, MomentCells, Moments
+from .quantiles import ValueSketch
+
+KEY_COLS = ["Gender", "LearningStyle", "Attendance"]
+GROUP_DIMS = ["AttendanceBucket", "PerformanceCategory", "StudyHoursBucket", "StressBucket", "ExamScore"]
+# (group dimension, value) pairs whose per-cell value distribution is kept for quantiles
+DISTRIBUTIONS = [("StudyHoursBucket", "ExamScore")]
+VALUE_COLS = [
+    "ExamScore", "Attendance", "StudyHours", "Discussions",
+    "AssignmentCompletion", "StressLevel", "Motivation",
+]
+
+
+def _cells(df: pd.DataFrame, keys: list, values: list) -> pd.DataFrame:
+    vals = df[values].astype("float64")
+    work = pd.concat(
+        [df[keys], vals.add_suffix("_sum"), (vals * vals).add_suffix("_sumsq")],
+        axis=1,
+    )
+    work.insert(len(keys), "count", 1)
+    return work.groupby(keys, observed=True, dropna=False, sort=False).sum().reset_index()
+
+
+def concat_frames(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """Row-wise concat that keeps categorical columns categorical.
+
+    ``pd.concat`` falls back to object dtype when the categories differ (e.g.
+    a newly appended segment introduces a label); here they are unioned,
+    keeping the first frame's category order.
+    """
+    frames = list(frames)
+    out = pd.concat(frames, ignore_index=True)
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype) and not isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = union_categoricals([frame[col] for frame in frames], ignore_order=True)
+    return out
+
+
+def _add_cells(a: pd.DataFrame, b: pd.DataFrame, keys: list) -> pd.DataFrame:
+    both = concat_frames([a, b])
+    return both.groupby(keys, observed=True, dropna=False, sort=False).sum().reset_index()
+
+
+class CubeQueries(abc.ABC):
+    """Chart-level queries on top of a backend's ``stats(spec, by)``.
+
+    ``stats`` returns one row per group of ``by`` with ``count``,
+    ``<col>_sum`` and ``<col>_sumsq`` (see :class:`AggregateCube`).
+    """
+
+    @abc.abstractmethod
+    def stats(self, spec: FilterSpec, by: Sequence[str] = ()) -> pd.DataFrame:
+        ...
+
+    @abc.abstractmethod
+    def moments(self, spec: FilterSpec) -> Moments:
+        """Moment sums of the available :data:`~analytics.moments.MOMENT_COLS` over matching rows."""
+
+    @abc.abstractmethod
+    def value_range(self, value: str) -> tuple:
+        """``(min, max)`` of ``value`` over every loaded row, ignoring filters (NaN if unknown)."""
+
+    def count(self, spec: FilterSpec, by: Sequence[str] = ()) -> pd.DataFrame:
+        return self.stats(spec, by)[list(by) + ["count"]].rename(columns={"count": "Count"})
+
+    def mean(self, spec: FilterSpec, by: Sequence[str], value: str) -> pd.DataFrame:
+        stats = self.stats(spec, by)
+        out = stats[list(by)].copy()
+        out[value] = stats[f"{value}_sum"] / stats["count"]
+        return out
+
+    def total_mean(self, spec: FilterSpec, value: str) -> float:
+        stats = self.stats(spec).iloc[0]
+        return stats[f"{value}_sum"] / stats["count"] if stats["count"] else float("nan")
+
+    def share(self, spec: FilterSpec, dim: str, label: str) -> float:
+        """Fraction of matching students whose ``dim`` equals ``label``."""
+        counts = self.stats(spec, [dim])
+        total = counts["count"].sum()
+        if not total:
+            return float("nan")
+        return counts.loc[counts[dim] == label, "count"].sum() / total
+
+
+class AggregateCube(CubeQueries):
+    """Cells of (count, sum, sum of squares) per filter key and grouping dimension.
+
+    Per filter key it also keeps the full cross-product matrix of the numeric
+    columns (:class:`~analytics.moments.MomentCells`) for correlations.
+    """
+
+    def __init__(self, df: pd.DataFrame, resolution: float = 1.0):
+        self.values = [col for col in VALUE_COLS if col in df.columns]
+        self.tables = {None: _cells(df, KEY_COLS, self.values)}
+        for dim in GROUP_DIMS:
+            if dim in df.columns:
+                self.tables[dim] = _cells(df, KEY_COLS + [dim], self.values)
+        self.moment_cells = MomentCells.from_frame(df, KEY_COLS, [col for col in MOMENT_COLS if col in df.columns])
+        self.ranges = {col: (float(df[col].min()), float(df[col].max())) for col in self.values}
+
+        self.resolution = resolution
+        self.distributions = {}
+        for dim, value in DISTRIBUTIONS:
+            if dim in df.columns and value in df.columns:
+                binned = (df[value].astype("float64") / resolution).round() * resolution
+                self.distributions[(dim, value)] = (
+                    df[KEY_COLS + [dim]]
+                    .assign(**{value: binned})
+                    .groupby(KEY_COLS + [dim, value], observed=True, dropna=False, sort=False)
+                    .size()
+                    .reset_index(name="count")
+                )
+
+    def merge(self, other: "AggregateCube") -> "AggregateCube":
+        """Cube over the rows of both cubes, e.g. the loaded data plus an appended segment.
+
+        Cells are sums, so matching cells just add up; costs O(cells), not rows.
+        Neither input is modified.
+        """
+        if other.resolution != self.resolution:
+            raise ValueError(f"Cannot merge cubes at resolutions {self.resolution} and {other.resolution}")
+        merged = copy.copy(self)
+        merged.values = [col for col in self.values if col in other.values]
+        merged.tables = {
+            dim: _add_cells(table, other.tables[dim], KEY_COLS + ([dim] if dim else []))
+            for dim, table in self.tables.items()
+            if dim in other.tables
+        }
+        merged.moment_cells = self.moment_cells.merge(other.moment_cells)
+        merged.ranges = {
+            col: (float(np.fmin(low, other.ranges[col][0])), float(np.fmax(high, other.ranges[col][1])))
+            for col, (low, high) in self.ranges.items()
+            if col in other.ranges
+        }
+        merged.distributions = {
+            (dim, value): _add_cells(table, other.distributions[(dim, value)], KEY_COLS + [dim, value])
+            for (dim, value), table in self.distributions.items()
+            if (dim, value) in other.distributions
+        }
+        return merged
+
+    def _table(self, by: Sequence[str]) -> pd.DataFrame:
+        extra = [col for col in by if col not in KEY_COLS]
+        if len(extra) > 1:
+            raise ValueError(f"Cube can group by at most one non-key dimension, got {extra}")
+        dim = extra[0] if extra else None
+        if dim not in self.tables:
+            raise KeyError(f"No cube cells for dimension {dim!r}")
+        return self.tables[dim]
+
+    @staticmethod
+    def _mask(table: pd.DataFrame, spec: FilterSpec) -> np.ndarray:
+        mask = np.ones(len(table), dtype=bool)
+        if spec.gender != ALL:
+            mask &= (table["Gender"] == spec.gender).to_numpy()
+        if spec.learning_style != ALL:
+            mask &= (table["LearningStyle"] == spec.learning_style).to_numpy()
+        if spec.attendance is not None:
+            low, high = spec.attendance
+            mask &= table["Attendance"].between(low, high).to_numpy()
+        return mask
+
+    @classmethod
+    def _select(cls, table: pd.DataFrame, spec: FilterSpec) -> pd.DataFrame:
+        return table[cls._mask(table, spec)]
+
+    def stats(self, spec: FilterSpec, by: Sequence[str] = ()) -> pd.DataFrame:
+        """Summed cells matching ``spec``, grouped by ``by`` (one row when empty)."""
+        by = list(by)
+        cells = self._select(self._table(by), spec)
+        stat_cols = [col for col in cells.columns if col not in KEY_COLS and col not in by]
+        if not by:
+            return cells[stat_cols].sum().to_frame().T
+        stats = cells.groupby(by, observed=True)[stat_cols].sum().reset_index()
+        return stats[stats["count"] > 0].reset_index(drop=True)
+
+    def value_range(self, value: str) -> tuple:
+        return self.ranges.get(value, (float("nan"), float("nan")))
+
+    def moments(self, spec: FilterSpec) -> Moments:
+        cells = self.moment_cells
+        return cells.total(self._mask(cells.keys, spec))
+
+    def attendance_sums(self, spec: FilterSpec, y: str, by: Sequence[str] = ()) -> pd.DataFrame:
+        """Regression sums of ``y`` on Attendance per group, plus the Attendance range.
+
+        Attendance is a cell key, so within a cell ``x`` is constant and
+        ``Σx = x·n``, ``Σx² = x²·n``, ``Σxy = x·Σy``.
+        """
+        by = list(by)
+        cells = self._select(self._table(by), spec)
+        cells = cells[(cells["count"] > 0) & cells["Attendance"].notna()]
+        x = cells["Attendance"].astype("float64")
+        parts = pd.DataFrame({
+            "n": cells["count"],
+            "sx": x * cells["count"],
+            "sy": cells[f"{y}_sum"],
+            "sxy": x * cells[f"{y}_sum"],
+            "sxx": x * x * cells["count"],
+            "x_min": x,
+            "x_max": x,
+        })
+        for col in by:
+            parts[col] = cells[col]
+        agg = {"n": "sum", "sx": "sum", "sy": "sum", "sxy": "sum", "sxx": "sum", "x_min": "min", "x_max": "max"}
+        if not by:
+            return parts.agg(agg).to_frame().T
+        return parts.groupby(by, observed=True).agg(agg).reset_index()
+
+    def sketches(self, spec: FilterSpec, dim: str, value: str) -> dict:
+        """Mergeable :class:`ValueSketch` of ``value`` per ``dim`` group for the filter."""
+        cells = self._select(self.distributions[(dim, value)], spec)
+        cells = cells[cells["count"] > 0].dropna(subset=[value])
+        return {
+            group: ValueSketch.from_counts(part[value], part["count"])
+            for group, part in cells.groupby(dim, observed=True)
+        }
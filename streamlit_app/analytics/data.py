@@ -0,0 +1,400 @@
+"""Loading the processed dataset, independent of Streamlit."""
+import itertools
+from functools import cached_property
+from pathlib import Path
+from typing import Optional, Sequence
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from . import cache, config
+from .buckets import categorize_buckets
+from .cube import AggregateCube, concat_frames
+from .drilldown import DRILL_COLS, SegmentIndex, page_order
+from .filters import FilterIndex, FilterSpec
+from .grid import bin_centers
+from .moments import TARGET_COLS
+
+PROCESSED_DIR = Path(__file__).resolve().parents[2] / "processed"
+DATA_PATH = PROCESSED_DIR / "student_performance_clean.parquet"
+CSV_PATH = PROCESSED_DIR / "student_performance_clean.csv"
+# Uncompressed single-batch Arrow IPC copy for memory-mapped, zero-copy loading (prep --arrow)
+ARROW_PATH = PROCESSED_DIR / "student_performance_clean.arrow"
+# Parquet dataset partitioned as Cohort=<name>/ (written by prep from a directory of raw files)
+PARTITIONED_DIR = PROCESSED_DIR / "student_performance"
+COHORT_COL = "Cohort"
+
+LEARNING_STYLE_MAP = {
+    0: "Visual",
+    1: "Auditory",
+    2: "Kinesthetic",
+    3: "Reading/Writing",
+}
+BINARY_COLS = ["Extracurricular", "Internet", "OnlineCourses", "EduTech"]
+ENGAGEMENT_METRICS = ["StudyHours", "Discussions", "AssignmentCompletion"]
+
+_memory_ids = itertools.count()
+# (backend, cohorts, path) -> cache key of the newest load, to find what an append added
+_latest_keys = {}
+
+
+def partition_path(root: Path, cohort: str) -> Path:
+    return root / f"{COHORT_COL}={quote(cohort, safe='')}"
+
+
+def list_cohorts(root: Path = PARTITIONED_DIR) -> list:
+    """Cohorts available in a partitioned dataset (from directory names, nothing is read)."""
+    if not root.is_dir():
+        return []
+    prefix = f"{COHORT_COL}="
+    return sorted(unquote(p.name[len(prefix):]) for p in root.glob(prefix + "*") if p.is_dir())
+
+
+def segments_dir(path: Path) -> Path:
+    """Where ``prep --append`` puts new segments of a single-file Parquet dataset."""
+    return path.with_suffix(".segments")
+
+
+def segment_paths(path: Path) -> list:
+    """Appended segment files of a single-file Parquet dataset, oldest first."""
+    root = segments_dir(path)
+    return sorted(root.glob("part-*.parquet")) if root.is_dir() else []
+
+
+def read_partitioned(root: Path = PARTITIONED_DIR, cohorts: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Read a cohort-partitioned dataset; only the selected cohorts' files are opened."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    partitioning = ds.partitioning(pa.schema([(COHORT_COL, pa.string())]), flavor="hive")
+    filters = [(COHORT_COL, "in", list(cohorts))] if cohorts else None
+    df = pd.read_parquet(root, partitioning=partitioning, filters=filters)
+    df[COHORT_COL] = df[COHORT_COL].astype("category")
+    return df
+
+
+def read_mapped(path: Path = ARROW_PATH) -> pd.DataFrame:
+    """Memory-map an Arrow IPC file and wrap it as a read-only DataFrame without copying.
+
+    Every process mapping the same file shares its physical pages through the
+    OS page cache. Columns are numpy views onto the mapping (writes raise), so
+    the file must hold a single record batch of null-free numeric and
+    dictionary columns, as written by ``prep --arrow``.
+    """
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def default_data_path() -> Path:
+    return PARTITIONED_DIR if list_cohorts(PARTITIONED_DIR) else DATA_PATH
+
+
+def read_processed(
+    path: Path = DATA_PATH, csv_path: Path = CSV_PATH, cohorts: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """Read the processed dataset, preferring the typed Parquet artifact.
+
+    ``path`` may also be a cohort-partitioned directory, read with partition
+    pruning on ``cohorts``.
+    """
+    if path.is_dir():
+        return read_partitioned(path, cohorts)
+
+    # Typed columnar artifact written by analytics.prep: categories & small ints, no re-mapping needed
+    if path.exists():
+        try:
+            segments = segment_paths(path)
+            return pd.read_parquet([path, *segments]) if segments else pd.read_parquet(path)
+        except ImportError:
+            pass  # no parquet engine installed -> fall back to the CSV below
+
+    df = pd.read_csv(csv_path)
+
+    # ---- Ensure human-readable labels ----
+    # If some columns got encoded as 0/1, convert them back to Yes/No or proper strings
+
+    # Gender: 0/1 -> Male/Female (if needed)
+    if df["Gender"].dtype != "O":  # not object (string)
+        df["Gender"] = df["Gender"].map({0: "Male", 1: "Female"}).fillna(df["Gender"].astype(str))
+
+    if df["LearningStyle"].dtype != "O":
+        df["LearningStyle"] = df["LearningStyle"].map(LEARNING_STYLE_MAP).fillna(df["LearningStyle"])
+
+    # LearningStyle: if encoded somehow, keep as string
+    df["LearningStyle"] = df["LearningStyle"].astype(str)
+
+    # Generic Yes/No mapping for certain columns if numeric
+    for col in BINARY_COLS:
+        if col in df.columns and df[col].dtype != "O":
+            df[col] = df[col].map({1: "Yes", 0: "No"}).fillna("Unknown")
+
+    return categorize_buckets(df)
+
+
+class Dataset:
+    """A loaded dataset and the state needed to answer metric queries on it.
+
+    Instances are treated as read-only and may be shared between sessions.
+    ``fingerprint`` identifies the source data in the result cache; frames
+    built in memory get a unique one.
+    """
+
+    def __init__(self, frame: pd.DataFrame, fingerprint: Optional[tuple] = None):
+        self.frame = frame
+        self.fingerprint = fingerprint or ("memory", next(_memory_ids))
+        self._last_positions = None
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.frame.columns
+
+    def has(self, column: str) -> bool:
+        return column in self.frame.columns
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    @cached_property
+    def index(self) -> FilterIndex:
+        return FilterIndex(self.frame)
+
+    @cached_property
+    def cube(self) -> AggregateCube:
+        return AggregateCube(self.frame)
+
+    @cached_property
+    def segments(self) -> SegmentIndex:
+        return SegmentIndex(self.frame)
+
+    def extend(self, frame: pd.DataFrame, fingerprint: Optional[tuple] = None) -> "Dataset":
+        """A new dataset with ``frame``'s rows appended; this one stays valid for its readers.
+
+        A cube already built here is merged with the new rows' cube instead of
+        being rebuilt over every row; the filter and segment indexes are rebuilt lazily.
+        """
+        extended = Dataset(concat_frames([self.frame, frame]) if len(frame) else self.frame, fingerprint)
+        if "cube" in self.__dict__:
+            extended.cube = self.cube.merge(AggregateCube(frame)) if len(frame) else self.cube
+        return extended
+
+    def positions(self, spec: FilterSpec) -> Optional[np.ndarray]:
+        """Row positions matching ``spec`` (None = all rows); the latest lookup is reused."""
+        last = self._last_positions
+        if last is not None and last[0] == spec:
+            return last[1]
+        positions = self.index.positions(spec)
+        self._last_positions = (spec, positions)
+        return positions
+
+    def count(self, spec: FilterSpec) -> int:
+        positions = self.positions(spec)
+        return len(self.frame) if positions is None else len(positions)
+
+    def filter(self, spec: FilterSpec, columns: Optional[list] = None) -> pd.DataFrame:
+        """Rows matching ``spec``, restricted to ``columns`` when given.
+
+        Only the requested columns of the matching rows are materialized; with
+        no filter active the frame itself is returned (treat it as read-only).
+        """
+        frame = self.frame if columns is None else self.frame[columns]
+        positions = self.positions(spec)
+        if positions is None:
+            return frame
+        return frame.take(positions)
+
+    def value_range(self, spec: FilterSpec, column: str) -> Optional[tuple]:
+        """``(min, max, integral)`` of ``column`` over matching rows, None if there are none."""
+        values = self.filter(spec, [column])[column].dropna().to_numpy(dtype="float64")
+        if values.size == 0:
+            return None
+        return float(values.min()), float(values.max()), bool(np.all(values == np.round(values)))
+
+    def grid_counts(self, spec: FilterSpec, axes: dict, by: Sequence[str] = ()) -> pd.DataFrame:
+        """Matching rows counted per grid cell; ``axes`` maps column -> :data:`~analytics.grid.Axis`."""
+        by = list(by)
+        df = self.filter(spec, list(axes) + by).dropna(subset=list(axes))
+        grid = pd.DataFrame({
+            col: bin_centers(df[col].to_numpy(dtype="float64"), axis) for col, axis in axes.items()
+        })
+        for col in by:
+            grid[col] = df[col].to_numpy()
+        return grid.groupby(by + list(axes), observed=True).size().reset_index(name="Count")
+
+    def options(self) -> dict:
+        """Values offered by the sidebar filters (no categories and a (0, 0) range when empty)."""
+        index = self.index
+        attendance = index.attendance_sorted[~np.isnan(index.attendance_sorted)]
+        return {
+            "gender": index.values("Gender"),
+            "learning_style": index.values("LearningStyle"),
+            "attendance": (float(attendance[0]), float(attendance[-1])) if attendance.size else (0.0, 0.0),
+        }
+
+    def engagement_metrics(self) -> list:
+        return [col for col in ENGAGEMENT_METRICS if self.has(col)]
+
+    def driver_targets(self) -> list:
+        return [col for col in TARGET_COLS if self.has(col)]
+
+    def drill_columns(self) -> list:
+        return [col for col in DRILL_COLS if self.has(col)]
+
+    def drill_values(self, column: str) -> list:
+        return self.segments.values(column)
+
+    def drill(
+        self,
+        spec: FilterSpec,
+        column: str,
+        value,
+        sort_by: str,
+        descending: bool,
+        offset: int,
+        limit: int,
+    ) -> tuple:
+        """``(total, page)``: how many rows match ``spec`` and ``column == value``, and
+        rows ``offset .. offset + limit`` of them sorted by ``sort_by``.
+
+        The segment's rows come from :attr:`segments` and are narrowed by the
+        filter index's category masks and the attendance range, so the cost is
+        proportional to the segment, and only the page's rows are copied.
+        """
+        rows = self.segments.rows(column, value)
+        mask = self.index.category_mask(spec)
+        if mask is not None:
+            rows = rows[mask[rows]]
+        if spec.attendance is not None:
+            low, high = spec.attendance
+            attendance = self.frame["Attendance"].to_numpy()[rows]
+            rows = rows[(attendance >= low) & (attendance <= high)]
+        keys = np.asarray(self.frame[sort_by].to_numpy()[rows], dtype="float64")
+        page = rows[page_order(keys, offset, limit, descending)]
+        return len(rows), self.frame.take(page).reset_index(drop=True)
+
+
+def load_dataset(
+    path: Optional[Path] = None,
+    csv_path: Path = CSV_PATH,
+    cohorts: Optional[Sequence[str]] = None,
+    backend: Optional[str] = None,
+    fingerprint: Optional[tuple] = None,
+):
+    """Load the processed data (partitioned dataset if present, else the single artifact).
+
+    ``backend`` (default ``config.BACKEND``) picks an in-memory :class:`Dataset`
+    ("pandas") or a :class:`~analytics.duckdb_backend.DuckDBDataset` that
+    leaves the data on disk ("duckdb"). With ``config.MMAP`` the pandas
+    dataset is a zero-copy view of the memory-mapped Arrow file.
+    """
+    path = path or default_data_path()
+    backend = backend or config.BACKEND
+    if backend == "duckdb":
+        from .duckdb_backend import DuckDBDataset
+
+        return DuckDBDataset(path, cohorts, threads=config.DUCKDB_THREADS or None, fingerprint=fingerprint)
+    if backend != "pandas":
+        raise ValueError(f"Unknown backend {backend!r} (expected 'pandas' or 'duckdb')")
+    if path.suffix == ".arrow":
+        return Dataset(read_mapped(path), fingerprint)
+    if _use_mapped(path, cohorts):
+        return Dataset(read_mapped(ARROW_PATH), fingerprint)
+    return Dataset(read_processed(path, csv_path, cohorts), fingerprint)
+
+
+def _use_mapped(path: Path, cohorts: Optional[Sequence[str]]) -> bool:
+    """Whether to map :data:`ARROW_PATH` instead of reading the Parquet data at ``path``.
+
+    Only while the Arrow copy is at least as new as the Parquet file and its
+    segments: a prep or append that did not refresh it falls back to Parquet.
+    """
+    if not (config.MMAP and not cohorts and path == DATA_PATH and ARROW_PATH.exists()):
+        return False
+    converted = ARROW_PATH.stat().st_mtime_ns
+    sources = [source for source in (DATA_PATH, *segment_paths(DATA_PATH)) if source.exists()]
+    return all(source.stat().st_mtime_ns <= converted for source in sources)
+
+
+def cached_dataset(
+    path: Optional[Path] = None,
+    csv_path: Path = CSV_PATH,
+    cohorts: Optional[Sequence[str]] = None,
+    backend: Optional[str] = None,
+):
+    """:func:`load_dataset`, reused for as long as the files it reads are unchanged.
+
+    Each call fingerprints the source (a few ``stat`` calls, or a content hash
+    with ``config.CACHE_CONTENT_HASH``); rewritten files produce a new key and
+    a fresh load (or, after an append, the old dataset extended with the new
+    files). The superseded dataset is then dropped from
+    :data:`analytics.cache.DATASETS`, so at most one version per source stays
+    cached; sessions still holding it keep it alive until they rerun, and its
+    results age out of :data:`analytics.cache.RESULTS`.
+    """
+    path = path or default_data_path()
+    backend = backend or config.BACKEND
+    cohorts = tuple(cohorts) if cohorts else None
+    if backend == "pandas" and path.suffix != ".arrow" and _use_mapped(path, cohorts):
+        sources = [ARROW_PATH]
+    elif path.is_dir():
+        sources = [path]
+    elif path.exists():
+        sources = [path, segments_dir(path)]
+    else:
+        sources = [csv_path]
+    key = (backend, cohorts, tuple(cache.fingerprint(source) for source in sources))
+    lineage = (backend, cohorts, str(path))
+
+    def load():
+        # After `prep --append` only new Parquet files show up: read just those onto the cached dataset
+        previous_key = _latest_keys.get(lineage)
+        previous = cache.DATASETS.get(previous_key) if backend == "pandas" and previous_key else None
+        added = _appended_files(previous_key[2], key[2]) if previous is not None else None
+        if added is not None:
+            return previous.extend(_read_appended(added, path, cohorts), fingerprint=key)
+        return load_dataset(path, csv_path, cohorts, backend, fingerprint=key)
+
+    data = cache.DATASETS.get_or_compute(key, load)
+    previous_key = _latest_keys.get(lineage)
+    _latest_keys[lineage] = key
+    if previous_key is not None and previous_key != key:
+        cache.DATASETS.pop(previous_key)
+    return data
+
+
+def _parquet_parts(fingerprints: tuple) -> dict:
+    parts = {}
+    for _, files in fingerprints:
+        for entry in files or ():
+            if entry[0].endswith(".parquet"):
+                parts[entry[0]] = entry
+    return parts
+
+
+def _appended_files(old: tuple, new: tuple) -> Optional[list]:
+    """Parquet files in ``new`` but not ``old``, or None unless every old file is unchanged."""
+    old_parts, new_parts = _parquet_parts(old), _parquet_parts(new)
+    if not old_parts or any(new_parts.get(name) != entry for name, entry in old_parts.items()):
+        return None
+    return sorted(Path(name) for name in new_parts.keys() - old_parts.keys())
+
+
+def _read_appended(files: list, path: Path, cohorts: Optional[Sequence[str]]) -> pd.DataFrame:
+    frames = []
+    for file in files:
+        if not path.is_dir():
+            frames.append(pd.read_parquet(file))
+            continue
+        cohort = unquote(file.parent.name.partition("=")[2])
+        if cohorts and cohort not in cohorts:
+            continue
+        frame = pd.read_parquet(file)
+        frame[COHORT_COL] = pd.Categorical([cohort] * len(frame))
+        frames.append(frame)
+    return concat_frames(frames) if frames else pd.DataFrame()
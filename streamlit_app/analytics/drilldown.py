@@ -0,0 +1,102 @@
+"""Student-level drill-down: the rows behind one chart segment, sorted and paginated.
+
+:class:`SegmentIndex` groups row positions by value for each bucket and
+category column (built lazily, one column at a time), so the rows of a segment
+are a slice rather than a scan. :func:`page_order` then picks just the visible
+page of the sort order with a partial sort, so only that page is ever
+materialized, whatever the segment size.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .buckets import BUCKETS, Bucket
+from .moments import FEATURE_COLS, TARGET_COLS
+
+# Columns a chart segment can be drilled into, and the numeric columns a page can be sorted by
+DRILL_COLS = ["PerformanceCategory", "AttendanceBucket", "StudyHoursBucket", "StressBucket", "LearningStyle", "Gender"]
+SORT_COLS = TARGET_COLS + FEATURE_COLS
+
+
+class SegmentIndex:
+    """Row positions grouped by value for each :data:`DRILL_COLS` column.
+
+    Per column: the positions sorted by value code (a stable argsort, so each
+    group stays in row order) and each value's ``[start, stop)`` range in it.
+    Positions are int32 when the frame allows, to halve the index size.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._columns = {}
+
+    def _column(self, column: str) -> tuple:
+        entry = self._columns.get(column)
+        if entry is None:
+            codes, uniques = pd.factorize(self.df[column])  # missing values get -1 and no group
+            dtype = np.int32 if len(codes) < 2**31 else np.int64
+            order = np.argsort(codes, kind="stable").astype(dtype)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            stops = np.cumsum(counts) + int((codes < 0).sum())
+            ranges = {value: (int(stop - count), int(stop)) for value, count, stop in zip(uniques, counts, stops)}
+            entry = self._columns[column] = (order, ranges)
+        return entry
+
+    def values(self, column: str) -> list:
+        """Values present in ``column``, in category order for ordered buckets."""
+        values = list(self._column(column)[1])
+        dtype = self.df[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and dtype.ordered:
+            return [value for value in dtype.categories if value in values]
+        return sorted(values, key=str)
+
+    def rows(self, column: str, value) -> np.ndarray:
+        """Ascending row positions where ``column == value``."""
+        order, ranges = self._column(column)
+        start, stop = ranges.get(value, (0, 0))
+        return order[start:stop]
+
+
+def page_order(values: np.ndarray, offset: int, limit: int, descending: bool = False) -> np.ndarray:
+    """Indices into ``values`` of sorted positions ``offset .. offset + limit``.
+
+    Missing values sort last and ties keep their input order, so consecutive
+    pages never overlap. Only the first ``offset + limit`` entries are fully
+    sorted: a partition finds the cutoff value and just the candidates at or
+    below it are ordered.
+    """
+    key = values.astype("float64")
+    if descending:
+        key = -key
+    key[np.isnan(key)] = np.inf
+    stop = min(offset + limit, len(key))
+    if offset >= stop:
+        return np.zeros(0, dtype=np.intp)
+    if stop * 4 < len(key):
+        cutoff = np.partition(key, stop - 1)[stop - 1]
+        candidates = np.flatnonzero(key <= cutoff)
+        return candidates[np.argsort(key[candidates], kind="stable")][offset:stop]
+    return np.argsort(key, kind="stable")[offset:stop]
+
+
+def _bucket(column: str) -> Optional[Bucket]:
+    return next((bucket for bucket in BUCKETS if bucket.column == column), None)
+
+
+def bucket_labels(column: str) -> Optional[list]:
+    """The fixed labels of a bucket column (None for data-dependent categories)."""
+    bucket = _bucket(column)
+    return list(bucket.labels) if bucket else None
+
+
+def segment_value(column: str, value):
+    """The ``column`` segment a clicked chart value stands for.
+
+    Category labels pass through; a number clicked on a bucket's source axis
+    (e.g. a StressLevel in a scatter) maps to the bucket it falls in.
+    """
+    bucket = _bucket(column)
+    if bucket is not None and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return bucket.assign(pd.Series([value]))[0]
+    return value
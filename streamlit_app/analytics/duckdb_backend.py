@@ -0,0 +1,269 @@
+"""DuckDB backend: query the processed Parquet data on disk instead of holding it in memory.
+
+:class:`DuckDBDataset` answers the same calls the metric functions make on a
+pandas :class:`~analytics.data.Dataset` (``count``, ``filter``, ``value_range``,
+``grid_counts``, ``options`` and the ``cube`` queries), but every filter and
+groupby is pushed down into SQL, so only small aggregated frames come back.
+DuckDB scans in parallel and, with a partitioned dataset, skips partitions
+that the cohort selection excludes.
+
+Requires the optional ``duckdb`` package; select it with ``DASHBOARD_BACKEND=duckdb``.
+"""
+import itertools
+import threading
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .buckets import categorize_buckets
+from .cube import DISTRIBUTIONS, VALUE_COLS, CubeQueries
+from .data import COHORT_COL, ENGAGEMENT_METRICS, segment_paths
+from .drilldown import DRILL_COLS, bucket_labels
+from .filters import ALL, FilterSpec
+from .moments import MOMENT_COLS, TARGET_COLS, Moments
+from .quantiles import ValueSketch
+
+_instance_ids = itertools.count()
+
+
+def _q(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _literal(value) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _where(spec: FilterSpec, not_null: Sequence[str] = ()) -> tuple:
+    clauses, params = [], []
+    if spec.gender != ALL:
+        clauses.append('"Gender" = ?')
+        params.append(spec.gender)
+    if spec.learning_style != ALL:
+        clauses.append('"LearningStyle" = ?')
+        params.append(spec.learning_style)
+    if spec.attendance is not None:
+        clauses.append('"Attendance" BETWEEN ? AND ?')
+        params.extend(spec.attendance)
+    clauses.extend(f"{_q(col)} IS NOT NULL" for col in not_null)
+    return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+class DuckDBDataset:
+    """Processed data served by an embedded DuckDB connection over the Parquet files."""
+
+    def __init__(
+        self,
+        path: Path,
+        cohorts: Optional[Sequence[str]] = None,
+        threads: Optional[int] = None,
+        fingerprint: Optional[tuple] = None,
+    ):
+        import duckdb
+
+        self.path = path
+        self.fingerprint = fingerprint or ("duckdb", next(_instance_ids))
+        self._con = duckdb.connect(database=":memory:")
+        if threads:
+            self._con.execute(f"SET threads = {int(threads)}")
+        self._local = threading.local()
+
+        if path.is_dir():
+            source = (
+                f"read_parquet({_literal(path.as_posix() + '/**/*.parquet')}, "
+                f"hive_partitioning = true, hive_types = {{{_literal(COHORT_COL)}: 'VARCHAR'}})"
+            )
+        else:
+            # The base file plus any segments appended by `prep --append`
+            files = ", ".join(_literal(p.as_posix()) for p in [path, *segment_paths(path)])
+            source = f"read_parquet([{files}], union_by_name = true)"
+        where = ""
+        if cohorts:
+            where = f"WHERE {_q(COHORT_COL)} IN ({', '.join(_literal(c) for c in cohorts)})"
+        # A view keeps nothing in memory; the cohort predicate prunes partitions at scan time
+        self._con.execute(f"CREATE VIEW students AS SELECT * FROM {source} {where}")
+        self._columns = [row[0] for row in self._con.execute("DESCRIBE students").fetchall()]
+        self.cube = DuckDBCube(self)
+
+    def _cursor(self):
+        # DuckDB connections are not safe to share across threads; cursors are
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self._con.cursor()
+        return cursor
+
+    def query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        return self._cursor().execute(sql, list(params)).fetchdf()
+
+    def __len__(self) -> int:
+        return self.count(FilterSpec())
+
+    @property
+    def columns(self) -> pd.Index:
+        return pd.Index(self._columns)
+
+    def has(self, column: str) -> bool:
+        return column in self._columns
+
+    def count(self, spec: FilterSpec) -> int:
+        where, params = _where(spec)
+        return int(self._cursor().execute(f"SELECT COUNT(*) FROM students {where}", params).fetchone()[0])
+
+    def filter(self, spec: FilterSpec, columns: Optional[list] = None) -> pd.DataFrame:
+        select = ", ".join(_q(col) for col in columns) if columns else "*"
+        where, params = _where(spec)
+        return categorize_buckets(self.query(f"SELECT {select} FROM students {where}", params))
+
+    def value_range(self, spec: FilterSpec, column: str) -> Optional[tuple]:
+        where, params = _where(spec, [column])
+        col = _q(column)
+        low, high, integral = self._cursor().execute(
+            f"SELECT MIN({col}), MAX({col}), BOOL_AND({col} = ROUND({col})) FROM students {where}", params
+        ).fetchone()
+        if low is None:
+            return None
+        return float(low), float(high), bool(integral)
+
+    def grid_counts(self, spec: FilterSpec, axes: dict, by: Sequence[str] = ()) -> pd.DataFrame:
+        by = list(by)
+        where, params = _where(spec, list(axes))
+        bins = []
+        for i, (col, (start, width, n)) in enumerate(axes.items()):
+            bins.append(f"LEAST(GREATEST(FLOOR(({_q(col)} - {start!r}) / {width!r}), 0), {n - 1}) AS b{i}")
+        keys = [_q(col) for col in by] + [f"b{i}" for i in range(len(axes))]
+        sql = (
+            f"SELECT {', '.join([_q(col) for col in by] + bins)}, COUNT(*) AS \"Count\" "
+            f"FROM students {where} GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}"
+        )
+        cells = self.query(sql, params)
+        out = cells[by].copy()
+        for i, (col, (start, width, _)) in enumerate(axes.items()):
+            out[col] = start + (cells[f"b{i}"].to_numpy(dtype="float64") + 0.5) * width
+        out["Count"] = cells["Count"].to_numpy()
+        return categorize_buckets(out)
+
+    def options(self) -> dict:
+        cursor = self._cursor()
+        genders = cursor.execute('SELECT DISTINCT "Gender" FROM students WHERE "Gender" IS NOT NULL').fetchall()
+        styles = cursor.execute(
+            'SELECT DISTINCT "LearningStyle" FROM students WHERE "LearningStyle" IS NOT NULL'
+        ).fetchall()
+        low, high = cursor.execute('SELECT MIN("Attendance"), MAX("Attendance") FROM students').fetchone()
+        return {
+            "gender": sorted(row[0] for row in genders),
+            "learning_style": sorted(row[0] for row in styles),
+            "attendance": (float(low), float(high)) if low is not None else (0.0, 0.0),
+        }
+
+    def engagement_metrics(self) -> list:
+        return [col for col in ENGAGEMENT_METRICS if self.has(col)]
+
+    def driver_targets(self) -> list:
+        return [col for col in TARGET_COLS if self.has(col)]
+
+    def drill_columns(self) -> list:
+        return [col for col in DRILL_COLS if self.has(col)]
+
+    def drill_values(self, column: str) -> list:
+        col = _q(column)
+        rows = self._cursor().execute(f"SELECT DISTINCT {col} FROM students WHERE {col} IS NOT NULL").fetchall()
+        present = {row[0] for row in rows}
+        labels = bucket_labels(column)
+        return [label for label in labels if label in present] if labels else sorted(present, key=str)
+
+    def drill(
+        self,
+        spec: FilterSpec,
+        column: str,
+        value,
+        sort_by: str,
+        descending: bool,
+        offset: int,
+        limit: int,
+    ) -> tuple:
+        """Same as :meth:`Dataset.drill`: DuckDB counts the segment and returns only the page (ties ordered by every column)."""
+        where, params = _where(spec)
+        where = f"{where} AND {_q(column)} = ?" if where else f"WHERE {_q(column)} = ?"
+        params = params + [value]
+        total = int(self._cursor().execute(f"SELECT COUNT(*) FROM students {where}", params).fetchone()[0])
+        order = [f"{_q(sort_by)} {'DESC' if descending else 'ASC'} NULLS LAST"]
+        order += [_q(col) for col in self._columns if col != sort_by]
+        page = self.query(
+            f"SELECT * FROM students {where} ORDER BY {', '.join(order)} LIMIT {int(limit)} OFFSET {int(offset)}", params
+        )
+        return total, categorize_buckets(page)
+
+
+class DuckDBCube(CubeQueries):
+    """Cube queries answered with GROUP BY over the DuckDB view."""
+
+    def __init__(self, dataset: DuckDBDataset, resolution: float = 1.0):
+        self.dataset = dataset
+        self.values = [col for col in VALUE_COLS if dataset.has(col)]
+        self.resolution = resolution
+
+    def value_range(self, value: str) -> tuple:
+        if value not in self.values:
+            return float("nan"), float("nan")
+        col = _q(value)
+        low, high = self.dataset._cursor().execute(f"SELECT MIN({col}), MAX({col}) FROM students").fetchone()
+        return (float("nan"), float("nan")) if low is None else (float(low), float(high))
+
+    def _grouped(self, spec: FilterSpec, by: list, aggregates: list, not_null: Sequence[str] = ()) -> pd.DataFrame:
+        where, params = _where(spec, list(by) + list(not_null))
+        keys = ", ".join(_q(col) for col in by)
+        select = ", ".join([keys] + aggregates) if by else ", ".join(aggregates)
+        group = f"GROUP BY {keys} ORDER BY {keys}" if by else ""
+        frame = categorize_buckets(self.dataset.query(f"SELECT {select} FROM students {where} {group}", params))
+        return frame.sort_values(by, ignore_index=True) if by else frame
+
+    def stats(self, spec: FilterSpec, by: Sequence[str] = ()) -> pd.DataFrame:
+        """Same columns as :meth:`AggregateCube.stats`, computed by DuckDB."""
+        by = list(by)
+        aggregates = ['COUNT(*) AS "count"']
+        for col in self.values:
+            aggregates.append(f"COALESCE(SUM(CAST({_q(col)} AS DOUBLE)), 0) AS {_q(col + '_sum')}")
+        for col in self.values:
+            value = f"CAST({_q(col)} AS DOUBLE)"
+            aggregates.append(f"COALESCE(SUM({value} * {value}), 0) AS {_q(col + '_sumsq')}")
+        return self._grouped(spec, by, aggregates)
+
+    def moments(self, spec: FilterSpec) -> Moments:
+        """Every column sum and pairwise product sum in one scan, over rows complete in all columns."""
+        columns = [col for col in MOMENT_COLS if self.dataset.has(col)]
+        values = [f"CAST({_q(col)} AS DOUBLE)" for col in columns]
+        pairs = [(i, j) for i in range(len(columns)) for j in range(i, len(columns))]
+        aggregates = ['COUNT(*) AS "n"']
+        aggregates += [f"COALESCE(SUM({v}), 0)" for v in values]
+        aggregates += [f"COALESCE(SUM({values[i]} * {values[j]}), 0)" for i, j in pairs]
+        row = self._grouped(spec, [], aggregates, not_null=columns).iloc[0].to_numpy(dtype="float64")
+        k = len(columns)
+        cross = np.zeros((k, k))
+        for (i, j), value in zip(pairs, row[1 + k:]):
+            cross[i, j] = cross[j, i] = value
+        return Moments(tuple(columns), float(row[0]), row[1:1 + k], cross)
+
+    def attendance_sums(self, spec: FilterSpec, y: str, by: Sequence[str] = ()) -> pd.DataFrame:
+        x, yv = 'CAST("Attendance" AS DOUBLE)', f"CAST({_q(y)} AS DOUBLE)"
+        aggregates = [
+            'COUNT(*) AS "n"', f'SUM({x}) AS "sx"', f'COALESCE(SUM({yv}), 0) AS "sy"',
+            f'COALESCE(SUM({x} * {yv}), 0) AS "sxy"', f'SUM({x} * {x}) AS "sxx"',
+            f'MIN({x}) AS "x_min"', f'MAX({x}) AS "x_max"',
+        ]
+        sums = self._grouped(spec, list(by), aggregates, not_null=["Attendance"])
+        return sums[sums["n"] > 0].reset_index(drop=True)
+
+    def sketches(self, spec: FilterSpec, dim: str, value: str) -> dict:
+        if (dim, value) not in DISTRIBUTIONS:
+            raise KeyError(f"No value distribution for {(dim, value)!r}")
+        res = self.resolution
+        aggregates = [f"ROUND(CAST({_q(value)} AS DOUBLE) / {res!r}) * {res!r} AS \"v\"", 'COUNT(*) AS "c"']
+        where, params = _where(spec, [dim, value])
+        sql = f"SELECT {_q(dim)}, {', '.join(aggregates)} FROM students {where} GROUP BY {_q(dim)}, \"v\""
+        cells = categorize_buckets(self.dataset.query(sql, params))
+        return {
+            group: ValueSketch.from_counts(part["v"], part["c"])
+            for group, part in cells.groupby(dim, observed=True)
+        }
@@ -0,0 +1,94 @@
+"""Sidebar filter state and the row index that applies it to a loaded frame."""
+import math
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+ALL = "All"
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    """Gender / learning style selection ("All" = no filter) and an inclusive attendance range."""
+
+    gender: str = ALL
+    learning_style: str = ALL
+    attendance: Optional[Tuple[float, float]] = None
+
+    def normalized(self, attendance_bounds: Optional[Tuple[float, float]] = None, digits: int = 1) -> "FilterSpec":
+        """Canonical form for cache keys: attendance dropped when it spans the whole
+        ``attendance_bounds`` range, else widened outward to ``digits`` decimals
+        (so rounding never excludes a selected row)."""
+        if self.attendance is None:
+            return self
+        low, high = (float(v) for v in self.attendance)
+        if attendance_bounds is not None and low <= attendance_bounds[0] and high >= attendance_bounds[1]:
+            return replace(self, attendance=None)
+        scale = 10**digits
+        # The inner round absorbs float noise such as 0.7 * 10 == 7.000000000000001
+        low = math.floor(round(low * scale, 6)) / scale
+        high = math.ceil(round(high * scale, 6)) / scale
+        return replace(self, attendance=(low, high))
+
+
+class FilterIndex:
+    """Row-position index over the filter columns, built once per loaded dataset.
+
+    Gender and LearningStyle get one boolean row mask per category; Attendance
+    is kept as a stable argsort so a range filter becomes a ``searchsorted``
+    slice. :meth:`positions` intersects them into sorted row positions, so
+    filtering never copies the frame itself.
+    """
+
+    CATEGORY_COLS = {"gender": "Gender", "learning_style": "LearningStyle"}
+
+    def __init__(self, df: pd.DataFrame):
+        self.n_rows = len(df)
+        self.masks = {}
+        for col in self.CATEGORY_COLS.values():
+            codes, uniques = pd.factorize(df[col])
+            self.masks[col] = {value: codes == code for code, value in enumerate(uniques)}
+
+        attendance = df["Attendance"].to_numpy(dtype="float64")
+        self.attendance_order = np.argsort(attendance, kind="stable")
+        self.attendance_sorted = attendance[self.attendance_order]
+
+    def values(self, column: str) -> list:
+        return sorted(self.masks[column])
+
+    def category_mask(self, spec: FilterSpec) -> Optional[np.ndarray]:
+        """AND of the selected category masks, or None when no category filter is set."""
+        mask = None
+        for field, col in self.CATEGORY_COLS.items():
+            value = getattr(spec, field)
+            if value == ALL:
+                continue
+            selected = self.masks[col].get(value)
+            if selected is None:
+                selected = np.zeros(self.n_rows, dtype=bool)
+            mask = selected if mask is None else mask & selected
+        return mask
+
+    def attendance_slice(self, spec: FilterSpec) -> slice:
+        """Slice of :attr:`attendance_order` covering the selected attendance range."""
+        if spec.attendance is None:
+            return slice(0, self.n_rows)
+        low, high = spec.attendance
+        start = np.searchsorted(self.attendance_sorted, low, side="left")
+        stop = np.searchsorted(self.attendance_sorted, high, side="right")
+        return slice(int(start), int(stop))
+
+    def positions(self, spec: FilterSpec) -> Optional[np.ndarray]:
+        """Sorted row positions matching ``spec``; None means "every row"."""
+        mask = self.category_mask(spec)
+        window = self.attendance_slice(spec)
+
+        if window.start == 0 and window.stop == self.n_rows:
+            return None if mask is None else np.flatnonzero(mask)
+
+        positions = self.attendance_order[window]
+        if mask is not None:
+            positions = positions[mask[positions]]
+        return np.sort(positions)
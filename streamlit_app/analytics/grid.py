@@ -0,0 +1,22 @@
+"""Uniform 1D binning shared by the pandas and SQL backends' density grids."""
+from typing import Tuple
+
+import numpy as np
+
+# (first edge, bin width, number of bins)
+Axis = Tuple[float, float, int]
+
+
+def uniform_bins(low: float, high: float, integral: bool, bins: int) -> Axis:
+    # Integer-valued axes with few distinct values get one unit-wide bin per value
+    if integral and high - low + 1 <= bins:
+        return low - 0.5, 1.0, int(high - low) + 1
+    if low == high:
+        return low - 0.5, 1.0, 1
+    return low, (high - low) / bins, bins
+
+
+def bin_centers(values: np.ndarray, axis: Axis) -> np.ndarray:
+    start, width, n = axis
+    idx = np.clip(np.floor((values - start) / width), 0, n - 1)
+    return start + (idx + 0.5) * width
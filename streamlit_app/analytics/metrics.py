@@ -0,0 +1,266 @@
+"""One function per dashboard metric.
+
+Each takes a :class:`~analytics.data.Dataset` and a :class:`~analytics.filters.FilterSpec`
+and returns a small frame (or dict of scalars) ready to be charted. Grouped
+numbers come from the dataset's :class:`~analytics.cube.AggregateCube`; only
+the per-student charts read rows. Aggregate results are memoized per dataset
+fingerprint and filter in :data:`analytics.cache.RESULTS`, so they are shared
+across sessions and must be treated as read-only.
+"""
+import numpy as np
+import pandas as pd
+
+from . import config
+from .cache import cached_result
+from .data import Dataset
+from .filters import FilterSpec
+from .grid import uniform_bins
+from .moments import FEATURE_COLS
+from .quantiles import BOX_COLUMNS, box_summary, sketch_box_summary
+from .trend import RegressionSums
+
+PERFORMANCE_COL = "PerformanceCategory"
+# Hero card bars: values averaged over the view, each drawn against its maximum in the data
+HERO_COLS = ["ExamScore", "Attendance", "Motivation"]
+
+
+# ---------- Overview ----------
+
+@cached_result
+def overview_kpis(data: Dataset, spec: FilterSpec) -> dict:
+    cube = data.cube
+    kpis = {
+        "students": int(cube.stats(spec)["count"].iloc[0]),
+        "avg_exam_score": cube.total_mean(spec, "ExamScore"),
+        "avg_attendance": cube.total_mean(spec, "Attendance"),
+    }
+    if data.has(PERFORMANCE_COL):
+        kpis["high_performer_pct"] = cube.share(spec, PERFORMANCE_COL, "High") * 100
+    return kpis
+
+
+@cached_result
+def hero_snapshot(data: Dataset, spec: FilterSpec) -> dict:
+    """Student count, the :data:`HERO_COLS` means and high-performer share for the hero card.
+
+    ``scales`` holds each mean's bar maximum: the column's largest value in the
+    whole dataset, so bars stay comparable across filters. One pass over the
+    cube's summed cells, independent of the row count.
+    """
+    stats = data.cube.stats(spec).iloc[0]
+    n = stats["count"]
+    snapshot = {"students": int(n), "means": {}, "scales": {}}
+    for col in HERO_COLS:
+        if f"{col}_sum" in stats:
+            snapshot["means"][col] = stats[f"{col}_sum"] / n if n else float("nan")
+            snapshot["scales"][col] = data.cube.value_range(col)[1]
+    if data.has(PERFORMANCE_COL):
+        snapshot["high_performer_pct"] = data.cube.share(spec, PERFORMANCE_COL, "High") * 100
+    return snapshot
+
+
+@cached_result
+def exam_score_histogram(data: Dataset, spec: FilterSpec, nbins: int = 30) -> pd.DataFrame:
+    """Binned ExamScore counts (BinStart, BinEnd, Count), built from per-score cube counts."""
+    counts = data.cube.count(spec, ["ExamScore"]).dropna(subset=["ExamScore"])
+    if counts.empty:
+        return pd.DataFrame({"BinStart": [], "BinEnd": [], "Count": []})
+    hist, edges = np.histogram(
+        counts["ExamScore"].to_numpy(dtype="float64"),
+        bins=nbins,
+        weights=counts["Count"].to_numpy(),
+    )
+    return pd.DataFrame({"BinStart": edges[:-1], "BinEnd": edges[1:], "Count": hist.astype("int64")})
+
+
+@cached_result
+def performance_counts(data: Dataset, spec: FilterSpec) -> pd.DataFrame:
+    return data.cube.count(spec, [PERFORMANCE_COL])
+
+
+@cached_result
+def learning_style_counts(data: Dataset, spec: FilterSpec) -> pd.DataFrame:
+    return data.cube.count(spec, ["LearningStyle"])
+
+
+# ---------- Attendance & study habits ----------
+
+@cached_result
+def score_by_attendance_bucket(data: Dataset, spec: FilterSpec) -> pd.DataFrame:
+    return data.cube.mean(spec, ["AttendanceBucket"], "ExamScore")
+
+
+def scatter_points(data: Dataset, spec: FilterSpec, x: str, y: str = "ExamScore") -> pd.DataFrame:
+    """Per-student (x, y) points, colored by PerformanceCategory when available."""
+    cols = [x, y] + ([PERFORMANCE_COL] if data.has(PERFORMANCE_COL) else [])
+    return data.filter(spec, cols)
+
+
+@cached_result
+def scatter_density(
+    data: Dataset, spec: FilterSpec, x: str, y: str = "ExamScore", bins: int = config.DENSITY_BINS
+) -> pd.DataFrame:
+    """Students counted on a ``bins × bins`` grid of (x, y), per PerformanceCategory.
+
+    Returns one row per non-empty grid cell with the cell center and ``Count``,
+    so the size of the result depends on the grid, not on the number of students.
+    """
+    color = [PERFORMANCE_COL] if data.has(PERFORMANCE_COL) else []
+    ranges = [data.value_range(spec, col) for col in (x, y)]
+    if None in ranges:
+        return pd.DataFrame(columns=color + [x, y, "Count"])
+    axes = {col: uniform_bins(*rng, bins) for col, rng in zip((x, y), ranges)}
+    return data.grid_counts(spec, axes, color)
+
+
+@cached_result
+def attendance_trendlines(data: Dataset, spec: FilterSpec, y: str = "ExamScore") -> pd.DataFrame:
+    """OLS fit of ``y`` on Attendance per PerformanceCategory, from cube sums.
+
+    One row per group with ``slope``, ``intercept`` and the line's endpoints
+    (``x0``, ``y0``) – (``x1``, ``y1``) over the group's attendance range.
+    """
+    by = [PERFORMANCE_COL] if data.has(PERFORMANCE_COL) else []
+    sums = data.cube.attendance_sums(spec, y, by)
+    rows = []
+    for _, row in sums.iterrows():
+        fit = RegressionSums(row["n"], row["sx"], row["sy"], row["sxy"], row["sxx"]).fit()
+        if fit is None:
+            continue
+        slope, intercept = fit
+        x0, x1 = float(row["x_min"]), float(row["x_max"])
+        line = {col: row[col] for col in by}
+        line.update(slope=slope, intercept=intercept, x0=x0, y0=intercept + slope * x0, x1=x1, y1=intercept + slope * x1)
+        rows.append(line)
+    return pd.DataFrame(rows, columns=by + ["slope", "intercept", "x0", "y0", "x1", "y1"])
+
+
+@cached_result
+def score_by_study_hours(data: Dataset, spec: FilterSpec) -> pd.DataFrame:
+    """Box-plot summary of ExamScore per StudyHoursBucket.
+
+    One row per bucket with ``q1, median, q3, lowerfence, upperfence, mean, n``
+    and ``outliers`` as ``(score, count)`` pairs. Small views are summarized
+    exactly from the rows; above ``config.BOX_EXACT_MAX_ROWS`` the cube's
+    mergeable sketches are combined instead.
+    """
+    if data.count(spec) <= config.BOX_EXACT_MAX_ROWS:
+        rows = data.filter(spec, ["StudyHoursBucket", "ExamScore"]).dropna(subset=["ExamScore"])
+        summaries = {
+            bucket: box_summary(group["ExamScore"])
+            for bucket, group in rows.groupby("StudyHoursBucket", observed=True)
+        }
+    else:
+        summaries = {
+            bucket: sketch_box_summary(sketch)
+            for bucket, sketch in data.cube.sketches(spec, "StudyHoursBucket", "ExamScore").items()
+        }
+    return pd.DataFrame(
+        [{"StudyHoursBucket": bucket, **summary} for bucket, summary in summaries.items()],
+        columns=["StudyHoursBucket"] + BOX_COLUMNS + ["outliers"],
+    )
+
+
+# ---------- Learning styles ----------
+
+@cached_result
+def score_by_learning_style(data: Dataset, spec: FilterSpec) -> pd.DataFrame:
+    return data.cube.mean(spec, ["LearningStyle"], "ExamScore")
+
+
+@cached_result
+def performance_by_learning_style(data: Dataset, spec: FilterSpec) -> pd.DataFrame:
+    return data.cube.count(spec, ["LearningStyle", PERFORMANCE_COL])
+
+
+@cached_result
+def engagement_by_learning_style(data: Dataset, spec: FilterSpec, metric: str) -> pd.DataFrame:
+    return data.cube.mean(spec, ["LearningStyle"], metric)
+
+
+# ---------- Stress & motivation ----------
+
+@cached_result
+def stress_motivation_summary(data: Dataset, spec: FilterSpec) -> dict:
+    """Average stress and motivation, with each column's ``(min, max)`` in the data as its scale."""
+    return {
+        "avg_stress": data.cube.total_mean(spec, "StressLevel"),
+        "avg_motivation": data.cube.total_mean(spec, "Motivation"),
+        "stress_range": data.cube.value_range("StressLevel"),
+        "motivation_range": data.cube.value_range("Motivation"),
+    }
+
+
+# ---------- Drivers ----------
+
+@cached_result
+def correlation_matrix(data: Dataset, spec: FilterSpec) -> pd.DataFrame:
+    """Pearson correlations between all numeric driver and outcome columns, from cube moment sums."""
+    return data.cube.moments(spec).correlation()
+
+
+@cached_result
+def driver_effects(data: Dataset, spec: FilterSpec, target: str = "ExamScore") -> pd.DataFrame:
+    """Effect size of every numeric feature on ``target``, strongest standardized effect first.
+
+    See :meth:`~analytics.moments.Moments.effects` for the columns; ``beta``
+    compares features on one scale while holding the others fixed.
+    """
+    moments = data.cube.moments(spec)
+    features = [col for col in FEATURE_COLS if col in moments.columns]
+    effects = moments.effects(target, features)
+    return effects.sort_values("beta", key=np.abs, ascending=False, na_position="last", ignore_index=True)
+
+
+# ---------- Drill-down ----------
+
+@cached_result
+def drill_down(
+    data: Dataset,
+    spec: FilterSpec,
+    column: str,
+    value,
+    sort_by: str = "ExamScore",
+    descending: bool = True,
+    page: int = 0,
+    page_size: int = 50,
+) -> dict:
+    """One page of the students in a chart segment (``column == value``) within ``spec``.
+
+    Returns ``total`` matching students, the ``page`` number, the number of
+    ``pages`` and the page's ``rows``; sorting happens here, so only the rows
+    shown are ever sent to the browser.
+    """
+    total, rows = data.drill(spec, column, value, sort_by, descending, page * page_size, page_size)
+    return {"total": total, "page": page, "pages": max(1, -(-total // page_size)), "rows": rows}
+
+
+def _position(value: float, value_range: tuple) -> float:
+    """Where ``value`` sits in ``value_range``, from 0 (min) to 1 (max); NaN without spread."""
+    low, high = value_range
+    return (value - low) / (high - low) if high > low else float("nan")
+
+
+def stress_motivation_insights(summary: dict) -> list:
+    """Plain-language suggestions for a :func:`stress_motivation_summary`.
+
+    Averages are judged by their position in the column's range in the data
+    (the same scale the hero card uses), so any coding of the levels works.
+    """
+    stress = _position(summary["avg_stress"], summary["stress_range"])
+    motivation = _position(summary["avg_motivation"], summary["motivation_range"])
+    insights = []
+    if stress >= 0.8:
+        insights.append("Stress levels are **high on average**. Consider providing counselling, stress-management workshops and flexible deadlines.")
+    elif stress >= 0.5:
+        insights.append("Stress levels are **moderate**. Monitor during exam periods and offer support proactively.")
+    else:
+        insights.append("Average stress is **relatively low**, but individual students may still need support.")
+
+    if motivation <= 0.4:
+        insights.append("Motivation appears **low**. Introduce goal-setting sessions, peer mentoring and more feedback on progress.")
+    elif motivation <= 0.7:
+        insights.append("Motivation is **moderate**. Small nudges like recognition, progress tracking and rewards can help.")
+    else:
+        insights.append("Motivation is **high on average**. Focus on maintaining engagement and providing challenging tasks.")
+    return insights
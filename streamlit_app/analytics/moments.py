@@ -0,0 +1,152 @@
+"""Correlations and regression effect sizes from mergeable moment sums.
+
+Means, covariances, correlations and a joint least-squares fit of any column
+on the others only need ``n``, ``Σx`` per column and the cross-product matrix
+``Σxxᵀ``. Those add up across filter cells, so the full matrix for any filter
+is a sum over precomputed cells plus O(k³) math for k columns.
+"""
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+# Numeric columns of the driver analysis: the features, then the outcomes
+FEATURE_COLS = [
+    "StudyHours", "Attendance", "Motivation", "Discussions",
+    "AssignmentCompletion", "StressLevel", "Age", "Resources",
+]
+TARGET_COLS = ["ExamScore", "FinalGrade"]
+MOMENT_COLS = FEATURE_COLS + TARGET_COLS
+
+
+@dataclass(frozen=True)
+class Moments:
+    """``n``, per-column ``sums`` and ``cross[i, j] = Σ xᵢ·xⱼ`` over complete rows."""
+
+    columns: tuple
+    n: float
+    sums: np.ndarray
+    cross: np.ndarray
+
+    def __add__(self, other: "Moments") -> "Moments":
+        return Moments(self.columns, self.n + other.n, self.sums + other.sums, self.cross + other.cross)
+
+    def mean(self) -> np.ndarray:
+        return self.sums / self.n if self.n else np.full(len(self.columns), np.nan)
+
+    def covariance(self) -> np.ndarray:
+        """Sample covariance matrix (NaN with fewer than two rows)."""
+        if self.n < 2:
+            return np.full(self.cross.shape, np.nan)
+        return (self.cross - np.outer(self.sums, self.sums) / self.n) / (self.n - 1)
+
+    def correlation(self) -> pd.DataFrame:
+        """Pearson correlation matrix; NaN for columns without spread."""
+        cov = self.covariance()
+        sd = np.sqrt(np.clip(np.diag(cov), 0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(sd, sd)
+        corr[~np.isfinite(corr)] = np.nan
+        np.fill_diagonal(corr, np.where(sd > 0, 1.0, np.nan))
+        return pd.DataFrame(np.clip(corr, -1, 1), index=list(self.columns), columns=list(self.columns))
+
+    def effects(self, target: str, features: Sequence[str]) -> pd.DataFrame:
+        """Per-feature effect sizes on ``target``.
+
+        One row per feature with the correlation ``r`` and ``r2``, the simple
+        regression ``slope`` (target units per feature unit), ``per_sd`` (target
+        units per standard deviation of the feature) and ``beta``, the
+        standardized coefficient of a joint least-squares fit on all features.
+        """
+        index = {col: i for i, col in enumerate(self.columns)}
+        f, t = [index[col] for col in features], index[target]
+        cov = self.covariance()
+        var = np.diag(cov)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sd = np.sqrt(np.clip(var, 0, None))
+            r = cov[f, t] / (sd[f] * sd[t])
+            slope = cov[f, t] / var[f]
+            beta = np.full(len(f), np.nan)
+            if np.isfinite(cov).all():
+                # lstsq: features without spread or perfectly collinear ones get the minimum-norm share
+                coef = np.linalg.lstsq(cov[np.ix_(f, f)], cov[f, t], rcond=None)[0]
+                beta = coef * sd[f] / sd[t]
+        effects = pd.DataFrame({
+            "Feature": list(features),
+            "r": r,
+            "r2": r * r,
+            "slope": slope,
+            "per_sd": slope * sd[f],
+            "beta": beta,
+        })
+        return effects.replace([np.inf, -np.inf], np.nan)
+
+
+@dataclass(frozen=True)
+class MomentCells:
+    """:class:`Moments` per filter cell: ``keys`` frame plus stacked ``n``, ``sums`` and ``cross`` arrays."""
+
+    columns: tuple
+    keys: pd.DataFrame
+    n: np.ndarray
+    sums: np.ndarray
+    cross: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, keys: Sequence[str], columns: Sequence[str]) -> "MomentCells":
+        """One pass over the rows: sorted by cell, each cell's block is one ``xᵀx`` product."""
+        keys, columns = list(keys), list(columns)
+        x = df[columns].to_numpy(dtype="float64")
+        codes, key_frame = _cell_codes(df, keys)
+        complete = ~np.isnan(x).any(axis=1)
+        if not complete.all():
+            codes, x = codes[complete], x[complete]
+        order = np.argsort(codes, kind="stable")
+        codes, x = codes[order], x.take(order, axis=0)
+        k = len(columns)
+        if not len(codes):
+            return cls(tuple(columns), key_frame.iloc[:0], np.zeros(0), np.zeros((0, k)), np.zeros((0, k, k)))
+        starts = np.r_[0, np.flatnonzero(np.diff(codes)) + 1]
+        ends = np.r_[starts[1:], len(codes)]
+        return cls(
+            tuple(columns),
+            key_frame.iloc[codes[starts]].reset_index(drop=True),
+            (ends - starts).astype("float64"),
+            np.add.reduceat(x, starts, axis=0),
+            np.stack([x[s:e].T @ x[s:e] for s, e in zip(starts, ends)]),
+        )
+
+    def total(self, mask: np.ndarray) -> Moments:
+        """Sum of the cells selected by a boolean ``mask``."""
+        return Moments(self.columns, float(self.n[mask].sum()), self.sums[mask].sum(axis=0), self.cross[mask].sum(axis=0))
+
+    def merge(self, other: "MomentCells") -> "MomentCells":
+        """Cells of both, with matching keys added up (e.g. loaded data plus an appended segment)."""
+        from .cube import concat_frames  # cube imports this module
+
+        codes, key_frame = _cell_codes(concat_frames([self.keys, other.keys]), list(self.keys.columns))
+        k = len(self.columns)
+        n, sums, cross = np.zeros(len(key_frame)), np.zeros((len(key_frame), k)), np.zeros((len(key_frame), k, k))
+        for part, idx in ((self, codes[:len(self.keys)]), (other, codes[len(self.keys):])):
+            np.add.at(n, idx, part.n)
+            np.add.at(sums, idx, part.sums)
+            np.add.at(cross, idx, part.cross)
+        return MomentCells(self.columns, key_frame, n, sums, cross)
+
+
+def _cell_codes(df: pd.DataFrame, keys: list) -> tuple:
+    """Cell number per row, and one row of ``keys`` per cell number (missing keys form cells too).
+
+    Mixed-radix product of per-key factorizations, compacted to the smallest
+    unsigned dtype so the callers' stable sorts run as radix sorts.
+    """
+    codes = np.zeros(len(df), dtype="int64")
+    for key in keys:
+        key_codes, uniques = pd.factorize(df[key], use_na_sentinel=False)
+        codes = codes * len(uniques) + key_codes
+    present = np.bincount(codes) > 0 if len(codes) else np.zeros(0, dtype=bool)
+    codes = (np.cumsum(present) - 1)[codes]
+    codes = codes.astype(np.min_scalar_type(max(int(codes.max(initial=0)), 0)))
+    first_rows = np.unique(codes, return_index=True)[1]
+    return codes, df[keys].iloc[first_rows].reset_index(drop=True)
@@ -0,0 +1,636 @@
+"""Data prep: raw CSV -> cleaned, bucketed, typed dataset.
+
+Streams the raw file in chunks so memory stays bounded by the chunk size:
+
+1. a first pass collects imputation statistics – a :class:`ValueSketch` per
+   numeric column for the median and a ``Counter`` per label column for the
+   mode – plus the value ranges needed to pick final dtypes;
+2. a second pass labels, imputes, buckets and types each chunk and appends it
+   to the processed CSV and Parquet files.
+
+Given a directory with one raw CSV per cohort, both passes run per file over
+a process pool and the output is a Parquet dataset partitioned by cohort.
+
+The statistics are saved next to the output, so a batch of new raw rows can
+later be appended without a rebuild: :func:`append` folds the batch into the
+stored statistics, cleans only the batch and writes it as a new segment file.
+
+Run from the repository root::
+
+    python -m streamlit_app.analytics.prep [--raw PATH_OR_DIR] [--chunksize N] [--workers N]
+    python -m streamlit_app.analytics.prep --append NEW_ROWS.csv [--cohort NAME]
+"""
+import argparse
+import json
+import os
+import shutil
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from .buckets import add_buckets
+from .data import (
+    ARROW_PATH, BINARY_COLS, CSV_PATH, DATA_PATH, LEARNING_STYLE_MAP, PARTITIONED_DIR, PROCESSED_DIR,
+    list_cohorts, partition_path, segment_paths, segments_dir,
+)
+from .quantiles import ValueSketch
+
+RAW_PATH = PROCESSED_DIR.parent / "data" / "student_performance.csv"
+CHUNK_SIZE = 100_000
+# Numeric medians are taken from sketches at this resolution (exact for data on the grid)
+MEDIAN_RESOLUTION = 0.01
+
+GENDER_MAP = {
+    0: "Female",
+    1: "Male",
+}
+EXPECTED_COLS = [
+    "StudyHours", "Attendance", "Resources", "Extracurricular",
+    "Motivation", "Internet", "Gender", "Age", "LearningStyle",
+    "OnlineCourses", "Discussions", "AssignmentCompletion",
+    "ExamScore", "EduTech", "StressLevel", "FinalGrade",
+]
+NUM_COLS = [
+    "StudyHours", "Attendance", "Motivation",
+    "Discussions", "AssignmentCompletion",
+    "ExamScore", "StressLevel", "Age",
+]
+INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+# ---------- Per-chunk transforms ----------
+
+def label_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Basic label cleanup (no 0/1 for gender, learning style & binary columns)."""
+    df = df.copy()
+
+    # Clean column names (remove spaces etc.)
+    df.columns = [c.strip() for c in df.columns]
+
+    # ---- Gender mapping (if encoded as numbers) ----
+    if "Gender" in df.columns and pd.api.types.is_numeric_dtype(df["Gender"]):
+        df["Gender"] = df["Gender"].map(GENDER_MAP).fillna(df["Gender"].astype(str))
+
+    # ---- Learning Style mapping (0/1/2/3 -> names) ----
+    if "LearningStyle" in df.columns:
+        if pd.api.types.is_numeric_dtype(df["LearningStyle"]):
+            df["LearningStyle"] = df["LearningStyle"].map(LEARNING_STYLE_MAP)
+        else:
+            # already string, just strip spaces
+            df["LearningStyle"] = df["LearningStyle"].astype(str).str.strip()
+
+    # ---- Yes/No style mappings for binary columns (keep as text, not 0/1) ----
+    for col in BINARY_COLS:
+        if col in df.columns:
+            df[col] = (
+                df[col]
+                .astype(str)
+                .str.strip()
+                .str.lower()
+                .map({"yes": "Yes", "no": "No"})
+                .fillna("Unknown")
+            )
+
+    # Convert numeric columns safely
+    for col in NUM_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    return df
+
+
+def _is_numeric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _smallest_int(low: float, high: float):
+    for dtype in INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+
+# ---------- Pass 1: imputation statistics ----------
+
+class ImputationStats:
+    """Streaming median / mode statistics per column.
+
+    Numeric columns keep a :class:`ValueSketch` (median); label columns keep a
+    ``Counter`` (mode, ties broken like ``Series.mode()[0]``). A column that
+    turns out non-numeric in a later chunk is moved over to a counter.
+    """
+
+    def __init__(self, resolution: float = MEDIAN_RESOLUTION):
+        self.resolution = resolution
+        self.sketches = {}
+        self.counters = {}
+        self.float_cols = set()
+        self.columns = []
+
+    def update(self, df: pd.DataFrame) -> "ImputationStats":
+        for col in df.columns:
+            if col not in self.columns:
+                self.columns.append(col)
+            series = df[col]
+            values = series.dropna()
+            if col not in self.counters and _is_numeric(series):
+                sketch = ValueSketch.from_values(values, self.resolution)
+                self.sketches[col] = self.sketches[col] + sketch if col in self.sketches else sketch
+                if series.hasnans or pd.api.types.is_float_dtype(series):
+                    self.float_cols.add(col)
+                continue
+
+            counter = self.counters.setdefault(col, Counter())
+            if col in self.sketches:
+                sketch = self.sketches.pop(col)
+                counter.update(dict(zip(sketch.values.tolist(), sketch.counts.tolist())))
+                self.float_cols.discard(col)
+            counter.update(values.tolist())
+        return self
+
+    def merge(self, other: "ImputationStats") -> "ImputationStats":
+        """Fold in statistics collected from another set of rows (e.g. another file)."""
+        for col in other.columns:
+            if col not in self.columns:
+                self.columns.append(col)
+        for col, sketch in other.sketches.items():
+            if col in self.counters:
+                self.counters[col].update(dict(zip(sketch.values.tolist(), sketch.counts.tolist())))
+            else:
+                self.sketches[col] = self.sketches[col] + sketch if col in self.sketches else sketch
+        for col, counter in other.counters.items():
+            mine = self.counters.setdefault(col, Counter())
+            if col in self.sketches:
+                sketch = self.sketches.pop(col)
+                mine.update(dict(zip(sketch.values.tolist(), sketch.counts.tolist())))
+            mine.update(counter)
+        self.float_cols |= other.float_cols
+        self.float_cols -= set(self.counters)
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "resolution": self.resolution,
+            "columns": self.columns,
+            "float_cols": sorted(self.float_cols),
+            "sketches": {
+                col: {"values": sketch.values.tolist(), "counts": sketch.counts.tolist()}
+                for col, sketch in self.sketches.items()
+            },
+            "counters": {col: list(counter.items()) for col, counter in self.counters.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "ImputationStats":
+        stats = cls(state["resolution"])
+        stats.columns = list(state["columns"])
+        stats.float_cols = set(state["float_cols"])
+        stats.sketches = {
+            col: ValueSketch(np.asarray(s["values"], dtype="float64"), np.asarray(s["counts"], dtype="int64"))
+            for col, s in state["sketches"].items()
+        }
+        stats.counters = {col: Counter(dict(map(tuple, items))) for col, items in state["counters"].items()}
+        return stats
+
+    def save(self, path: Path):
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict()))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "ImputationStats":
+        return cls.from_dict(json.loads(path.read_text()))
+
+    def fill_values(self) -> dict:
+        fills = {}
+        for col, sketch in self.sketches.items():
+            fills[col] = sketch.quantile(0.5) if sketch.n else np.nan
+        for col, counter in self.counters.items():
+            if counter:
+                top = max(counter.values())
+                fills[col] = sorted(v for v, c in counter.items() if c == top)[0]
+        return fills
+
+    def dtypes(self) -> dict:
+        """Final dtype per column: float64, the smallest int, or a fixed-category dtype."""
+        dtypes = {}
+        for col, sketch in self.sketches.items():
+            if col in self.float_cols or not sketch.n:
+                dtypes[col] = np.float64
+            else:
+                dtypes[col] = _smallest_int(sketch.values.min(), sketch.values.max())
+        for col, counter in self.counters.items():
+            categories = sorted(str(v) for v in counter)
+            dtypes[col] = pd.CategoricalDtype(categories)
+        return dtypes
+
+
+def stats_path(output: Path) -> Path:
+    """Sidecar holding the imputation statistics of a processed Parquet file or partitioned directory."""
+    # Leading underscore: Parquet dataset readers skip it inside a partitioned directory
+    return output / "_stats.json" if output.is_dir() else output.with_suffix(".stats.json")
+
+
+def read_chunks(path: Path, chunksize: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def collect_stats(chunks: Iterable[pd.DataFrame], resolution: float = MEDIAN_RESOLUTION) -> ImputationStats:
+    stats = ImputationStats(resolution)
+    for chunk in chunks:
+        stats.update(label_columns(chunk))
+
+    missing = [c for c in EXPECTED_COLS if c not in stats.columns]
+    if missing:
+        print("⚠ Warning: Missing columns in CSV:", missing)
+    return stats
+
+
+# ---------- Pass 2: clean, bucket, type ----------
+
+def clean_chunk(df: pd.DataFrame, stats: ImputationStats) -> pd.DataFrame:
+    """Label, impute (global median / mode), bucket and type one chunk."""
+    df = label_columns(df)
+
+    # Basic missing value handling
+    # Numeric → median, Categorical → mode
+    df = df.fillna({col: value for col, value in stats.fill_values().items() if col in df.columns})
+
+    dtypes = stats.dtypes()
+    for col in df.columns:
+        dtype = dtypes.get(col)
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(str).astype(dtype)
+        elif dtype is not None:
+            df[col] = df[col].astype(dtype)
+
+    # ---------- Derived features ----------
+    return add_buckets(df)
+
+
+def load_data(path: Path = RAW_PATH) -> pd.DataFrame:
+    """Whole raw file with labels cleaned up (convenient for notebooks on small data)."""
+    return label_columns(pd.read_csv(path))
+
+
+def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    """In-memory equivalent of the streaming prep for a single frame."""
+    return clean_chunk(df, collect_stats([df]))
+
+
+class ProcessedWriter:
+    """Appends cleaned chunks to the processed CSV and (if pyarrow is available) Parquet file.
+
+    With ``append`` the CSV is extended instead of rewritten. With a pyarrow
+    ``schema`` every chunk is cast to it, so a new segment reads back together
+    with the existing files; a value that does not fit raises.
+    """
+
+    def __init__(
+        self,
+        csv_path: Optional[Path] = CSV_PATH,
+        parquet_path: Optional[Path] = DATA_PATH,
+        append: bool = False,
+        schema=None,
+    ):
+        self.csv_path = csv_path
+        self.parquet_path = parquet_path
+        self.append = append
+        self.schema = schema
+        self.rows = 0
+        self.columns = None
+        self._parquet = None
+
+    def write(self, df: pd.DataFrame):
+        if self.schema is not None:
+            df = _conform(df, self.schema)
+        if self.csv_path is not None:
+            first = self.rows == 0 and not self.append
+            df.to_csv(self.csv_path, index=False, mode="w" if first else "a", header=first)
+        if self.parquet_path is not None:
+            self._write_parquet(df)
+        self.rows += len(df)
+        self.columns = df.shape[1]
+
+    def _write_parquet(self, df: pd.DataFrame):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("⚠ pyarrow not installed – skipping", self.parquet_path)
+            self.parquet_path = None
+            return
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.schema is not None:
+            table = table.cast(self.schema)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.parquet_path, table.schema)
+        self._parquet.write_table(table)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+
+def _conform(df: pd.DataFrame, schema) -> pd.DataFrame:
+    """Order ``df``'s columns like ``schema`` and round imputed values in integer columns."""
+    import pyarrow as pa
+
+    missing = [name for name in schema.names if name not in df.columns]
+    if missing:
+        raise ValueError(f"New rows lack columns of the processed data: {missing}")
+    df = df[schema.names].copy()
+    for field in schema:
+        # Stored as integers, but a missing value in the batch was filled with a fractional median
+        if pa.types.is_integer(field.type) and pd.api.types.is_float_dtype(df[field.name]):
+            df[field.name] = df[field.name].round()
+    return df
+
+
+def run(
+    raw_path: Path = RAW_PATH,
+    csv_path: Optional[Path] = CSV_PATH,
+    parquet_path: Optional[Path] = DATA_PATH,
+    chunksize: int = CHUNK_SIZE,
+    arrow: bool = False,
+) -> ProcessedWriter:
+    """Clean ``raw_path`` into the processed CSV and Parquet files.
+
+    Both are written to hidden ``.<name>.tmp`` files next to their targets and
+    swapped in with ``os.replace`` only once complete, so a running app never
+    reads a half-written file; segments appended to the previous version are
+    removed just before the swap. The memory-mappable Arrow copy next to the
+    Parquet file is rewritten with ``arrow`` or whenever one already exists,
+    so it never outlives the data it was converted from.
+    """
+    stats = collect_stats(read_chunks(raw_path, chunksize))
+
+    for path in (csv_path, parquet_path):
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_csv, tmp_parquet = (path and path.with_name(f".{path.name}.tmp") for path in (csv_path, parquet_path))
+    writer = ProcessedWriter(tmp_csv, tmp_parquet)
+    try:
+        try:
+            for chunk in read_chunks(raw_path, chunksize):
+                writer.write(clean_chunk(chunk, stats))
+        finally:
+            writer.close()
+    except BaseException:
+        for tmp_path in (tmp_csv, tmp_parquet):
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+        raise
+
+    for path in (parquet_path, csv_path):
+        if path is not None:
+            stats.save(stats_path(path))
+            break
+    if writer.parquet_path is not None:
+        # Segments appended to the previous version of this file no longer apply
+        shutil.rmtree(segments_dir(parquet_path), ignore_errors=True)
+        os.replace(tmp_parquet, parquet_path)
+        writer.parquet_path = parquet_path
+    if tmp_csv is not None:
+        os.replace(tmp_csv, csv_path)
+        writer.csv_path = csv_path
+    if parquet_path is not None:
+        arrow_path = parquet_path.with_suffix(".arrow")
+        if writer.parquet_path is None:
+            arrow_path.unlink(missing_ok=True)  # no pyarrow to refresh it with
+        elif arrow or arrow_path.exists():
+            write_arrow(parquet_path, arrow_path)
+    return writer
+
+
+def write_arrow(parquet_path: Path = DATA_PATH, arrow_path: Path = ARROW_PATH) -> int:
+    """Convert the processed Parquet file to a memory-mappable Arrow IPC file.
+
+    The output is uncompressed with a single record batch so the app can wrap
+    it without copying (see :func:`analytics.data.read_mapped`). Unlike the
+    streaming passes this holds the typed table in memory once. The file is
+    swapped in atomically, so apps still mapping the old file keep a valid view.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Appended segments share the base file's schema (see ``append``)
+    tables = [pq.read_table(path) for path in [parquet_path, *segment_paths(parquet_path)]]
+    table = pa.concat_tables(tables).combine_chunks()
+    tmp_path = arrow_path.with_name(arrow_path.name + ".tmp")
+    with pa.ipc.new_file(tmp_path, table.schema) as writer:
+        writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+    os.replace(tmp_path, arrow_path)
+    return table.num_rows
+
+
+# ---------- Many raw files -> partitioned dataset ----------
+
+def raw_files(raw_dir: Path) -> list:
+    return sorted(raw_dir.glob("*.csv"))
+
+
+def _has_rows(path: Path) -> bool:
+    try:
+        return not pd.read_csv(path, nrows=1).empty
+    except pd.errors.EmptyDataError:  # not even a header
+        return False
+
+
+def _file_stats(path: Path, chunksize: int, resolution: float) -> ImputationStats:
+    stats = ImputationStats(resolution)
+    for chunk in read_chunks(path, chunksize):
+        stats.update(label_columns(chunk))
+    return stats
+
+
+def _clean_file(path: Path, stats: ImputationStats, out_path: Path, chunksize: int) -> int:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    writer = ProcessedWriter(csv_path=None, parquet_path=out_path)
+    try:
+        for chunk in read_chunks(path, chunksize):
+            writer.write(clean_chunk(chunk, stats))
+    finally:
+        writer.close()
+    return writer.rows
+
+
+def run_partitioned(
+    raw_dir: Path,
+    out_dir: Path = PARTITIONED_DIR,
+    chunksize: int = CHUNK_SIZE,
+    workers: Optional[int] = None,
+    resolution: float = MEDIAN_RESOLUTION,
+) -> dict:
+    """Prep one raw CSV per cohort (file stem) in parallel into ``<out_dir>/Cohort=<stem>/``.
+
+    Both passes fan out over a process pool: per-file statistics are merged
+    into one global set so imputation and category dtypes agree across
+    partitions, then every file is cleaned into its own partition. Files
+    without rows are skipped, so every cohort offered has data. Returns rows
+    written per cohort.
+    """
+    files = raw_files(raw_dir)
+    empty = [path for path in files if not _has_rows(path)]
+    if empty:
+        print("⚠ Skipping raw files without rows:", [path.name for path in empty])
+        files = [path for path in files if path not in empty]
+    if not files:
+        raise FileNotFoundError(f"No raw CSV files with rows in {raw_dir}")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        stats = ImputationStats(resolution)
+        for file_stats in pool.map(_file_stats, files, repeat(chunksize), repeat(resolution)):
+            stats.merge(file_stats)
+
+        missing = [c for c in EXPECTED_COLS if c not in stats.columns]
+        if missing:
+            print("⚠ Warning: Missing columns in CSV:", missing)
+
+        if out_dir.exists():
+            shutil.rmtree(out_dir)
+        outputs = [partition_path(out_dir, path.stem) / "part-0.parquet" for path in files]
+        rows = pool.map(_clean_file, files, repeat(stats), outputs, repeat(chunksize))
+        rows = dict(zip((path.stem for path in files), rows))
+    stats.save(stats_path(out_dir))
+    return rows
+
+
+# ---------- Appending new raw rows ----------
+
+def _next_part(directory: Path) -> Path:
+    numbers = [int(p.stem.partition("-")[2]) for p in directory.glob("part-*.parquet")]
+    return directory / f"part-{max(numbers, default=0) + 1:05d}.parquet"
+
+
+def append(
+    raw_path: Path,
+    target: Path = DATA_PATH,
+    csv_path: Optional[Path] = CSV_PATH,
+    cohort: Optional[str] = None,
+    chunksize: int = CHUNK_SIZE,
+) -> ProcessedWriter:
+    """Clean a batch of new raw rows and add it to processed data as a new segment.
+
+    ``target`` is the processed Parquet file (the batch goes to
+    ``<name>.segments/part-NNNNN.parquet`` and is appended to ``csv_path``) or
+    a partitioned directory (the batch goes to a new part file of ``cohort``'s
+    partition, default: the raw file's stem). Only the batch is read: its
+    statistics are merged into the stored ones, which impute and type it, and
+    the segment is cast to the existing schema. Rows already written keep the
+    values imputed when they were written.
+
+    Like :func:`run`, the segment and the extended CSV are written to hidden
+    ``.<name>.tmp`` files and renamed into place only once both are complete,
+    so a failed append leaves the processed data as it was.
+    """
+    import pyarrow.parquet as pq
+
+    sidecar = stats_path(target)
+    if not sidecar.exists():
+        raise FileNotFoundError(f"No imputation statistics at {sidecar}; run the full prep once first")
+    if target.is_dir():
+        cohort = cohort or raw_path.stem
+        existing = sorted(target.glob("*/*.parquet"))
+        out_dir = partition_path(target, cohort)
+        csv_path = None
+    else:
+        existing = [target]
+        out_dir = segments_dir(target)
+    if not existing or not existing[0].exists():
+        raise FileNotFoundError(f"No processed data at {target} to append to")
+    if not _has_rows(raw_path):
+        raise ValueError(f"No rows to append in {raw_path}")
+
+    stats = ImputationStats.load(sidecar)
+    stats.merge(collect_stats(read_chunks(raw_path, chunksize), stats.resolution))
+    new_dir = not out_dir.exists()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    segment = _next_part(out_dir)
+    if csv_path is not None and not csv_path.exists():
+        csv_path = None
+    tmp_parquet, tmp_csv = (path and path.with_name(f".{path.name}.tmp") for path in (segment, csv_path))
+    try:
+        if tmp_csv is not None:
+            shutil.copyfile(csv_path, tmp_csv)  # extended on a copy; the original stays readable
+        writer = ProcessedWriter(tmp_csv, tmp_parquet, append=True, schema=pq.read_schema(existing[0]))
+        try:
+            for chunk in read_chunks(raw_path, chunksize):
+                writer.write(clean_chunk(chunk, stats))
+        finally:
+            writer.close()
+        stats.save(sidecar)
+        os.replace(tmp_parquet, segment)
+        if tmp_csv is not None:
+            os.replace(tmp_csv, csv_path)
+    finally:
+        for tmp_path in (tmp_parquet, tmp_csv):
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+        if new_dir and not any(out_dir.iterdir()):
+            out_dir.rmdir()  # no partition for a cohort whose first append failed
+    writer.parquet_path, writer.csv_path = segment, csv_path
+    return writer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean and bucket the raw student performance CSV.")
+    parser.add_argument("--raw", type=Path, default=RAW_PATH, help="raw input CSV, or a directory of one CSV per cohort")
+    parser.add_argument("--csv", type=Path, default=CSV_PATH, help="processed CSV output")
+    parser.add_argument("--parquet", type=Path, default=DATA_PATH, help="processed Parquet output")
+    parser.add_argument("--no-csv", action="store_true", help="only write the Parquet artifact")
+    parser.add_argument("--arrow", action="store_true", help="also write the memory-mappable Arrow file (DASHBOARD_MMAP)")
+    parser.add_argument("--out-dir", type=Path, default=PARTITIONED_DIR, help="partitioned output (directory input)")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="rows per streamed chunk")
+    parser.add_argument("--workers", type=int, default=None, help="processes for directory input (default: all cores)")
+    parser.add_argument("--append", type=Path, default=None, help="raw CSV of new rows to add to the processed data as a new segment")
+    parser.add_argument(
+        "--cohort",
+        default=None,
+        help="with --append to a partitioned --out-dir: add to this cohort's partition (default: the raw file's name)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.append is not None:
+        # Append to the layout the dashboard loads: the partitioned dataset when there is one
+        partitioned = bool(list_cohorts(args.out_dir))
+        if args.cohort and not partitioned:
+            parser.error(f"--cohort needs a partitioned dataset in {args.out_dir} (see --out-dir)")
+        target = args.out_dir if partitioned else args.parquet
+        writer = append(args.append, target, None if args.no_csv else args.csv, args.cohort, args.chunksize)
+        print(f"✅ Appended {writer.rows:,} cleaned rows as: {writer.parquet_path}")
+        if writer.csv_path is not None:
+            print(f"✅ Appended to: {writer.csv_path}")
+        arrow_path = args.parquet.with_suffix(".arrow")
+        if target == args.parquet and (args.arrow or arrow_path.exists()):
+            write_arrow(args.parquet, arrow_path)
+            print(f"✅ Refreshed memory-mappable copy: {arrow_path}")
+        return
+
+    if args.raw.is_dir():
+        rows = run_partitioned(args.raw, args.out_dir, args.chunksize, args.workers)
+        print("✅ Cleaning & feature engineering done.")
+        print(f"✅ Saved {len(rows)} cohort partitions ({sum(rows.values()):,} rows) to: {args.out_dir}")
+        return
+
+    arrow_path = args.parquet.with_suffix(".arrow")
+    refresh_arrow = args.arrow or arrow_path.exists()
+    writer = run(args.raw, None if args.no_csv else args.csv, args.parquet, args.chunksize, args.arrow)
+    print("✅ Cleaning & feature engineering done.")
+    for path in (writer.csv_path, writer.parquet_path):
+        if path is not None:
+            print(f"✅ Saved cleaned data to: {path}")
+    if refresh_arrow and writer.parquet_path is not None:
+        print(f"✅ Saved memory-mappable copy to: {arrow_path}")
+    print("Final shape:", (writer.rows, writer.columns))
+
+
+if __name__ == "__main__":
+    main()
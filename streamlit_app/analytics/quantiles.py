@@ -0,0 +1,87 @@
+"""Five-number summaries for box plots, exact or from a mergeable sketch.
+
+:class:`ValueSketch` keeps counts per value rounded to a fixed ``resolution``.
+Sketches of disjoint row sets add up exactly, so a sketch per filter cell can
+be precomputed and combined for any filter; quantiles are exact whenever the
+data already lies on the resolution grid (integer scores with resolution 1).
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+BOX_COLUMNS = ["q1", "median", "q3", "lowerfence", "upperfence", "mean", "n"]
+
+
+@dataclass(frozen=True)
+class ValueSketch:
+    values: np.ndarray  # sorted, unique
+    counts: np.ndarray
+
+    @classmethod
+    def from_counts(cls, values, counts) -> "ValueSketch":
+        frame = pd.DataFrame({"v": np.asarray(values, dtype="float64"), "c": np.asarray(counts, dtype="int64")})
+        frame = frame[frame["c"] > 0].groupby("v")["c"].sum()
+        return cls(frame.index.to_numpy(), frame.to_numpy())
+
+    @classmethod
+    def from_values(cls, values, resolution: float = 1.0) -> "ValueSketch":
+        values = np.asarray(values, dtype="float64")
+        values = np.round(values[~np.isnan(values)] / resolution) * resolution
+        uniques, counts = np.unique(values, return_counts=True)
+        return cls(uniques, counts)
+
+    def __add__(self, other: "ValueSketch") -> "ValueSketch":
+        return ValueSketch.from_counts(
+            np.concatenate([self.values, other.values]),
+            np.concatenate([self.counts, other.counts]),
+        )
+
+    @property
+    def n(self) -> int:
+        return int(self.counts.sum())
+
+    def mean(self) -> float:
+        return float((self.values * self.counts).sum() / self.n)
+
+    def quantile(self, q: float) -> float:
+        """Same result as ``np.quantile`` (linear method) on the expanded values."""
+        cumulative = np.cumsum(self.counts)
+        position = q * (self.n - 1)
+        lower, upper = int(np.floor(position)), int(np.ceil(position))
+        lo_val = self.values[np.searchsorted(cumulative, lower, side="right")]
+        hi_val = self.values[np.searchsorted(cumulative, upper, side="right")]
+        return float(lo_val + (hi_val - lo_val) * (position - lower))
+
+
+def _fences(values: np.ndarray, q1: float, q3: float):
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return float(inside.min()), float(inside.max())
+
+
+def box_summary(values) -> dict:
+    """Exact box-plot statistics (plotly's linear quartiles, 1.5×IQR whiskers) and outliers."""
+    values = np.asarray(values, dtype="float64")
+    values = values[~np.isnan(values)]
+    q1, median, q3 = (float(v) for v in np.quantile(values, [0.25, 0.5, 0.75]))
+    low, high = _fences(values, q1, q3)
+    outliers = values[(values < low) | (values > high)]
+    uniques, counts = np.unique(outliers, return_counts=True)
+    return {
+        "q1": q1, "median": median, "q3": q3, "lowerfence": low, "upperfence": high,
+        "mean": float(values.mean()), "n": int(values.size),
+        "outliers": list(zip(uniques.tolist(), counts.tolist())),
+    }
+
+
+def sketch_box_summary(sketch: ValueSketch) -> dict:
+    """Box-plot statistics from a sketch; outliers are reported as (value, count) pairs."""
+    q1, median, q3 = (sketch.quantile(q) for q in (0.25, 0.5, 0.75))
+    low, high = _fences(sketch.values, q1, q3)
+    out = (sketch.values < low) | (sketch.values > high)
+    return {
+        "q1": q1, "median": median, "q3": q3, "lowerfence": low, "upperfence": high,
+        "mean": sketch.mean(), "n": sketch.n,
+        "outliers": list(zip(sketch.values[out].tolist(), sketch.counts[out].tolist())),
+    }
@@ -0,0 +1,180 @@
+"""Synthetic raw data at any scale, shaped like ``data/student_performance.csv``.
+
+:class:`SyntheticModel` learns each column's empirical marginal, its missing
+rate and the rank correlations between columns (a Gaussian copula) from the
+raw file. Columns that are a function of another one (FinalGrade of
+ExamScore) are reproduced exactly through a lookup table instead.
+
+Rows are generated in independent, seeded chunks over a process pool; each
+worker writes its chunk to a part file that is appended to the output in
+order, so memory stays bounded by the chunk size and throughput scales with
+cores. The output uses the raw schema and integer encodings, ready for
+``prep``.
+
+Run from the repository root::
+
+    python -m streamlit_app.analytics.synth --rows 100000000 [--out PATH] [--workers N] [--seed N]
+"""
+import argparse
+import os
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import NormalDist
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .prep import RAW_PATH
+
+SYNTHETIC_PATH = RAW_PATH.with_name("student_performance_synthetic.csv")
+CHUNK_SIZE = 1_000_000
+# Cumulative probabilities are clipped away from 0/1 before mapping to normal scores
+_EPS = 1e-9
+
+
+def _normal_quantiles(p: np.ndarray) -> np.ndarray:
+    inv_cdf = NormalDist().inv_cdf
+    return np.array([inv_cdf(v) for v in np.clip(p, _EPS, 1 - _EPS)])
+
+
+def _nearest_correlation(corr: np.ndarray) -> np.ndarray:
+    # Clip tiny/negative eigenvalues so the matrix has a Cholesky factor
+    vals, vecs = np.linalg.eigh(corr)
+    fixed = (vecs * np.maximum(vals, 1e-6)) @ vecs.T
+    scale = np.sqrt(np.diag(fixed))
+    return fixed / np.outer(scale, scale)
+
+
+@dataclass(frozen=True)
+class SyntheticModel:
+    """Gaussian copula over empirical marginals, plus exact lookups for derived columns.
+
+    ``latent`` columns are sampled jointly; for each, ``values`` is the sorted
+    support and ``cuts`` the normal-score boundaries between consecutive
+    values. ``derived`` maps a column to ``(source, table)`` with ``table``
+    aligned to the source column's support.
+    """
+
+    columns: tuple
+    latent: tuple
+    values: tuple
+    cuts: tuple
+    chol: np.ndarray
+    derived: dict
+    missing: dict
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame) -> "SyntheticModel":
+        columns = tuple(df.columns)
+        derived_from = {}
+        nunique = df.nunique()
+        for b in columns:
+            for a in columns:
+                if a == b or a in derived_from or nunique[a] <= nunique[b]:
+                    continue
+                if (df.groupby(a)[b].nunique() <= 1).all():
+                    derived_from[b] = a
+                    break
+        latent = tuple(col for col in columns if col not in derived_from)
+
+        values, cuts, scores = [], [], {}
+        for col in latent:
+            probs = df[col].value_counts(normalize=True).sort_index()
+            cum = probs.to_numpy().cumsum()
+            mid = _normal_quantiles(cum - probs.to_numpy() / 2)
+            support = probs.index.to_numpy()
+            if support.dtype.kind == "f" and np.all(support == np.round(support)):
+                support = support.astype(np.int64)  # integer codes read as float because of NaNs
+            values.append(support)
+            cuts.append(_normal_quantiles(cum[:-1]))
+            # Mid-rank normal score of every row, for the correlation estimate
+            scores[col] = pd.Series(mid, index=probs.index).reindex(df[col]).to_numpy()
+        complete = pd.DataFrame(scores).dropna()
+        corr = np.corrcoef(complete.to_numpy(), rowvar=False) if len(latent) > 1 else np.ones((1, 1))
+        chol = np.linalg.cholesky(_nearest_correlation(np.nan_to_num(corr)))
+
+        derived = {}
+        for b, a in derived_from.items():
+            support = values[latent.index(a)]
+            table = df.dropna(subset=[a]).groupby(a)[b].first().reindex(support)
+            derived[b] = (a, table.to_numpy())
+        missing = {col: float(rate) for col, rate in df.isna().mean().items() if rate > 0}
+        return cls(columns, latent, tuple(values), tuple(cuts), chol, derived, missing)
+
+    def sample(self, n: int, rng: np.random.Generator) -> pd.DataFrame:
+        z = rng.standard_normal((n, len(self.latent)), dtype=np.float32) @ self.chol.T.astype(np.float32)
+        positions, out = {}, {}
+        for j, col in enumerate(self.latent):
+            positions[col] = np.searchsorted(self.cuts[j], z[:, j])
+            out[col] = self.values[j][positions[col]]
+        for col, (source, table) in self.derived.items():
+            out[col] = table[positions[source]]
+        df = pd.DataFrame(out, columns=list(self.columns))
+        for col, rate in self.missing.items():
+            if pd.api.types.is_integer_dtype(df[col]):
+                df[col] = df[col].astype(pd.Int64Dtype())  # stays integral in the CSV
+            df.loc[rng.random(n) < rate, col] = pd.NA
+        return df
+
+
+def _write_part(model: SyntheticModel, path: Path, rows: int, seed: np.random.SeedSequence) -> Path:
+    model.sample(rows, np.random.default_rng(seed)).to_csv(path, index=False, header=False)
+    return path
+
+
+def generate(
+    model: SyntheticModel,
+    out: Path,
+    rows: int,
+    chunksize: int = CHUNK_SIZE,
+    workers: Optional[int] = None,
+    seed: int = 0,
+) -> Path:
+    """Write ``rows`` synthetic rows to ``out`` (CSV, raw schema); reproducible for a given seed and chunksize."""
+    workers = workers or os.cpu_count() or 1
+    sizes = [min(chunksize, rows - start) for start in range(0, rows, chunksize)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    parts_dir = out.with_name(out.name + ".parts")
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    parts_dir.mkdir(parents=True)
+    tmp = out.with_name(out.name + ".tmp")
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool, open(tmp, "wb") as f:
+            f.write((",".join(model.columns) + "\n").encode())
+            pending = deque()
+            for i, (size, chunk_seed) in enumerate(zip(sizes, seeds)):
+                pending.append(pool.submit(_write_part, model, parts_dir / f"part-{i:06d}.csv", size, chunk_seed))
+                # Keep a bounded window in flight and append finished parts in order
+                while len(pending) > 2 * workers or (pending and i == len(sizes) - 1):
+                    part = pending.popleft().result()
+                    with open(part, "rb") as p:
+                        shutil.copyfileobj(p, f, 1 << 24)
+                    part.unlink()
+        os.replace(tmp, out)
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        tmp.unlink(missing_ok=True)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic raw student performance data at scale.")
+    parser.add_argument("--rows", type=int, required=True, help="number of rows to generate")
+    parser.add_argument("--fit", type=Path, default=RAW_PATH, help="raw CSV to learn distributions from")
+    parser.add_argument("--out", type=Path, default=SYNTHETIC_PATH, help="synthetic CSV output")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="rows per generated chunk")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+
+    model = SyntheticModel.fit(pd.read_csv(args.fit))
+    generate(model, args.out, args.rows, args.chunksize, args.workers, args.seed)
+    print(f"✅ Saved {args.rows:,} synthetic rows to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
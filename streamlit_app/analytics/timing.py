@@ -0,0 +1,126 @@
+"""Opt-in span timing for dashboard reruns (``DASHBOARD_TIMING=1``).
+
+A :class:`Trace` is started per rerun and made current for the running
+thread; :func:`span` then times a block and records extra fields (rows,
+payload bytes, cache hits) on it. With no current trace, :func:`span` costs a
+context-variable lookup and records nothing. Finished traces can be appended
+to a JSON-lines log for offline analysis.
+
+:data:`STARTUP` separately records milestones of the first run in the
+process, i.e. what a cold start (deploy, pod restart) costs the first user.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+_current = contextvars.ContextVar("dashboard_trace", default=None)
+_log_lock = threading.Lock()
+
+
+class Trace:
+    """Spans recorded during one rerun, in start order, with nesting depth."""
+
+    def __init__(self, **meta):
+        self.meta = meta
+        self.spans = []
+        self._depth = 0
+        self._start = time.perf_counter()
+        self._token = None
+
+    def __enter__(self) -> "Trace":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.meta["total_ms"] = (time.perf_counter() - self._start) * 1000
+        _current.reset(self._token)
+
+    @contextmanager
+    def span(self, name: str, **fields):
+        record = {"name": name, "depth": self._depth, "start_ms": (time.perf_counter() - self._start) * 1000}
+        record.update(fields)
+        self.spans.append(record)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["ms"] = (time.perf_counter() - start) * 1000
+            self._depth -= 1
+
+    def to_dict(self) -> dict:
+        return {**self.meta, "spans": self.spans}
+
+    def append_to(self, path: Path):
+        line = json.dumps(self.to_dict(), default=str)
+        with _log_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def current() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, **fields):
+    """Time a block on the current trace; yields a dict for extra fields (a throwaway one if not tracing)."""
+    trace = _current.get()
+    if trace is None:
+        yield fields
+        return
+    with trace.span(name, **fields) as record:
+        yield record
+
+
+def process_uptime() -> Optional[float]:
+    """Seconds since this process started (from ``/proc``; None where unavailable)."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rpartition(")")[2].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class Startup:
+    """Milestones (ms since the run started) of the first script run in this process."""
+
+    def __init__(self):
+        self.process_s = None  # process age when that run started: server boot + wait for a session
+        self.milestones = {}
+        self._run = None
+        self._lock = threading.Lock()
+
+    def begin(self, run_start: float) -> bool:
+        """Claim the first run, identified by its ``perf_counter`` start; True only for that run."""
+        with self._lock:
+            if self._run is None:
+                self._run = run_start
+                uptime = process_uptime()
+                if uptime is not None:
+                    self.process_s = uptime - (time.perf_counter() - run_start)
+            return self._run == run_start
+
+    def mark(self, name: str, run_start: float):
+        """Record ``name`` once, if the run started at ``run_start`` is the first run."""
+        if self._run == run_start and name not in self.milestones:
+            self.milestones[name] = (time.perf_counter() - run_start) * 1000
+
+    def to_dict(self) -> dict:
+        return {"process_s": self.process_s, **{f"{name}_ms": ms for name, ms in self.milestones.items()}}
+
+    def summary(self) -> str:
+        parts = [f"{name} {ms:.0f} ms" for name, ms in self.milestones.items()]
+        if self.process_s is not None:
+            parts.insert(0, f"process up {self.process_s:.1f} s")
+        return "Cold start: " + ", ".join(parts)
+
+
+STARTUP = Startup()
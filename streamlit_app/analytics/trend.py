@@ -0,0 +1,26 @@
+"""Least-squares trendlines from mergeable running sums.
+
+A fit only needs ``n, Σx, Σy, Σxy, Σx²``; those add up across filter cells,
+so a trendline for any filter is a sum over precomputed cells
+(:meth:`~analytics.cube.AggregateCube.attendance_sums`) plus O(1) math.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RegressionSums:
+    n: float = 0.0
+    sx: float = 0.0
+    sy: float = 0.0
+    sxy: float = 0.0
+    sxx: float = 0.0
+
+    def fit(self) -> Optional[Tuple[float, float]]:
+        """``(slope, intercept)`` of y on x, or None when x has no spread."""
+        denom = self.n * self.sxx - self.sx * self.sx
+        if self.n < 2 or denom <= 0:
+            return None
+        slope = (self.n * self.sxy - self.sx * self.sy) / denom
+        intercept = (self.sy - slope * self.sx) / self.n
+        return slope, intercept
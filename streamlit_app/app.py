@@ -1,45 +1,50 @@
-import streamlit as st 
-import pandas as pd 
-import plotly.express as px 
-from pathlib import Path
-import plotly.io as pio
+import time
+
+# Taken before the imports below, which only cost anything on a process's first run
+RUN_START = time.perf_counter()
+
+import importlib
+import json
+import logging
+import sys
+from typing import Optional
 
-DATA_PATH = Path("../processed/student_performance_clean.csv")
+import streamlit as st 
+import plotly.graph_objects as go
 
+import analytics
+from analytics import FilterSpec, timing
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv(DATA_PATH)
 
-    # ---- Ensure human-readable labels ----
-    # If some columns got encoded as 0/1, convert them back to Yes/No or proper strings
+class LazyModule:
+    """Stands in for module ``name`` and imports it on first attribute access."""
 
-    # Gender: 0/1 -> Male/Female (if needed)
-    if df["Gender"].dtype != "O":  # not object (string)
-        df["Gender"] = df["Gender"].map({0: "Male", 1: "Female"}).fillna(df["Gender"].astype(str))
+    def __init__(self, name: str):
+        self._name = name
 
-    # Learning Style mapping
-    learning_style_map = {
-            0: "Visual",
-            1: "Auditory",
-            2: "Kinesthetic",
-            3: "Reading/Writing"
-        }
+    def __getattr__(self, attr):
+        module = sys.modules.get(self._name)
+        if module is None:
+            with timing.span(f"import:{self._name}"):
+                module = importlib.import_module(self._name)
+        return getattr(module, attr)
 
-    if df["LearningStyle"].dtype != "O":
-        df["LearningStyle"] = df["LearningStyle"].map(learning_style_map).fillna(df["LearningStyle"])
 
+if analytics.config.FAST_START:
+    # plotly.express and the chart builders load when the first chart is drawn
+    figures = LazyModule("figures")
+else:
+    import figures
 
-    # LearningStyle: if encoded somehow, keep as string
-    df["LearningStyle"] = df["LearningStyle"].astype(str)
+FIRST_RUN = timing.STARTUP.begin(RUN_START)
+timing.STARTUP.mark("imports", RUN_START)
 
-    # Generic Yes/No mapping for certain columns if numeric
-    binary_cols = ["Extracurricular", "Internet", "OnlineCourses", "EduTech"]
-    for col in binary_cols:
-        if col in df.columns and df[col].dtype != "O":
-            df[col] = df[col].map({1: "Yes", 0: "No"}).fillna("Unknown")
 
-    return df
+def load_data(cohorts=None) -> analytics.Dataset:
+    # Shared, read-only dataset held in the process-wide analytics cache; a prep run
+    # that rewrites the processed files changes the fingerprint and triggers a reload.
+    # With a cohort-partitioned dataset only the selected cohorts are read
+    return analytics.cached_dataset(cohorts=cohorts)
 
 
 def add_light_minimal_theme():
@@ -240,73 +245,232 @@ def metric_card(title: str, value: str):
     )
 
 
-def overview_tab(df: pd.DataFrame):
+def hero_bar(label: str, mean: float, scale: float) -> str:
+    # NaN mean (no students) or no usable scale -> empty bar
+    width = min(max(mean / scale * 100, 0), 100) if mean == mean and scale > 0 else 0
+    return f"""
+                    <div class="hero-right-bar-row">
+                        <div class="hero-right-bar-label">{label}</div>
+                        <div class="hero-right-bar-track">
+                            <div class="hero-right-bar-fill" style="width: {width:.0f}%;"></div>
+                        </div>
+                    </div>"""
+
+
+def hero_banner(snapshot: dict):
+    """Page header with the live snapshot card for the current filters."""
+    labels = {"ExamScore": "Exam Score", "Attendance": "Attendance", "Motivation": "Motivation"}
+    bars = "".join(
+        hero_bar(labels[col], mean, snapshot["scales"][col]) for col, mean in snapshot["means"].items()
+    )
+    high = snapshot.get("high_performer_pct")
+    high_text = "–" if high is None or high != high else f"{high:.1f} %"
+    st.markdown(
+        f"""
+        <div class="hero-container">
+            <div>
+                <div class="hero-pill">
+                    🎓 Student Analytics • End-to-End
+                </div>
+                <div class="hero-left-title">
+                    Student Performance Analytics Dashboard
+                </div>
+                <div class="hero-left-subtitle">
+                    Analyze study habits, attendance, learning styles, stress and motivation
+                    to understand how they influence exam performance and final grades.
+                </div>
+                <div class="hero-tags">
+                    <span class="hero-tag">Study Hours</span>
+                    <span class="hero-tag">Attendance</span>
+                    <span class="hero-tag">Learning Styles</span>
+                    <span class="hero-tag">Stress</span>
+                    <span class="hero-tag">Motivation</span>
+                </div>
+            </div>
+            <div class="hero-right-card">
+                <div class="hero-right-header">
+                    <div class="hero-right-title">Current Cohort Snapshot</div>
+                    <div class="hero-right-badge">Live view</div>
+                </div>
+                <div class="hero-right-bars">{bars}
+                </div>
+                <div class="hero-metrics-row">
+                    <div class="hero-metric-chip">
+                        <div class="hero-metric-label">Students</div>
+                        <div class="hero-metric-value">{snapshot["students"]:,}</div>
+                    </div>
+                    <div class="hero-metric-chip">
+                        <div class="hero-metric-label">High performers</div>
+                        <div class="hero-metric-value">{high_text}</div>
+                    </div>
+                </div>
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+# ---------- Figures ----------
+# Builders live in figures.py; each depends only on (data, spec, *args), so its
+# output is shared by every session looking at the same filters.
+
+@st.cache_resource
+def figure_cache() -> analytics.BoundedCache:
+    # One LRU of serialized figures per server process, shared by all sessions
+    return analytics.BoundedCache(
+        analytics.config.FIGURE_CACHE_ENTRIES,
+        max_bytes=analytics.config.FIGURE_CACHE_MB * 2**20,
+        ttl=analytics.config.CACHE_TTL or None,
+    )
+
+
+def figure_json(builder, data: analytics.Dataset, spec: FilterSpec, *args) -> str:
+    """``builder(data, spec, *args)`` as figure JSON, memoized per data version and filters."""
+    key = (builder.__name__, data.fingerprint, spec, args)
+    cache = figure_cache()
+    with timing.span("figure", cached=key in cache) as span:
+        payload = cache.get_or_compute(key, lambda: builder(data, spec, *args).to_json())
+        span["bytes"] = len(payload)
+    return payload
+
+
+def plot(builder, data: analytics.Dataset, spec: FilterSpec, *args, drill: Optional[str] = None):
+    """Draw a cached chart; with ``drill``, clicking a segment opens the drill-down on that ``drill`` column value."""
+    with timing.span(f"chart:{builder.__name__}"):
+        # The payload was serialized from a validated figure: skip plotly's re-validation
+        # (pio.from_json would redo it, costing more than a cached chart saves)
+        fig = go.Figure(json.loads(figure_json(builder, data, spec, *args)), _validate=False)
+        with timing.span("plotly_chart"):
+            if drill is None or not data.has(drill):
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                key = f"chart:{builder.__name__}"
+                st.plotly_chart(
+                    fig,
+                    use_container_width=True,
+                    key=key,
+                    on_select=lambda: select_segment(key, drill),
+                    selection_mode="points",
+                )
+    timing.STARTUP.mark("first_chart", RUN_START)
+
+
+def select_segment(key: str, column: str):
+    """``on_select`` callback of a drillable chart: point the drill-down at the clicked segment."""
+    points = st.session_state[key]["selection"]["points"]
+    if points:
+        point = points[0]
+        st.session_state["drill_column"] = column
+        st.session_state["drill_value"] = analytics.drilldown.segment_value(column, point.get("x", point.get("label")))
+        drill_changed()
+
+
+def drill_changed():
+    """A new segment or sort order: open the drill-down at its first page."""
+    st.session_state["drill_open"] = True
+    st.session_state["drill_page"] = 1
+
+
+def drilldown_panel(data: analytics.Dataset, spec: FilterSpec):
+    """The students behind one segment: sorted and paginated server-side, one page sent at a time."""
+    columns = data.drill_columns()
+    if not columns:
+        return
+    state = st.session_state
+    if state.get("drill_column") not in columns:
+        state["drill_column"] = columns[0]
+    values = data.drill_values(state["drill_column"])
+    if state.get("drill_value") not in values:
+        state["drill_value"] = values[0] if values else None
+    opened = state.get("drill_open", False)
+    label = f"🔎 Students – {state['drill_column']}: {state['drill_value']}" if opened else "🔎 Student drill-down"
+    with st.expander(label, expanded=opened):
+        st.markdown(
+            "<p class='section-subtitle'>Click a bar or point in a chart above, or pick a segment here.</p>",
+            unsafe_allow_html=True,
+        )
+        col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+        column = col1.selectbox("Segment column", columns, key="drill_column", on_change=drill_changed)
+        if not values:
+            st.info("No students in any segment of this column.")
+            return
+        value = col2.selectbox("Segment", values, key="drill_value", on_change=drill_changed)
+        sort_columns = [col for col in analytics.drilldown.SORT_COLS if data.has(col)]
+        sort_by = col3.selectbox("Sort by", sort_columns, key="drill_sort", on_change=drill_changed)
+        descending = col4.toggle("Descending", value=True, key="drill_desc", on_change=drill_changed)
+
+        page_size = analytics.config.DRILL_PAGE_SIZE
+        page = state.get("drill_page", 1)
+        result = analytics.drill_down(data, spec, column, value, sort_by, descending, page - 1, page_size)
+        if page > result["pages"]:  # the filters shrank the segment
+            page = state["drill_page"] = result["pages"]
+            result = analytics.drill_down(data, spec, column, value, sort_by, descending, page - 1, page_size)
+
+        st.caption(f"{result['total']:,} students in the current view · page {page:,} of {result['pages']:,}")
+        st.dataframe(result["rows"], hide_index=True)
+        st.number_input("Page", min_value=1, max_value=result["pages"], step=1, key="drill_page")
+
+
+def timing_panel(trace: timing.Trace):
+    """Collapsible sidebar table of this rerun's spans (DASHBOARD_TIMING=1)."""
+    with st.sidebar.expander(f"⏱ Rerun timing – {trace.meta['total_ms']:.0f} ms"):
+        if timing.STARTUP.milestones:
+            st.caption(timing.STARTUP.summary())
+        st.dataframe(
+            [
+                {
+                    "span": "\u2003" * s["depth"] + s["name"],
+                    "ms": round(s["ms"], 1),
+                    **{k: s[k] for k in ("rows_in", "rows_out", "bytes", "cached") if k in s},
+                }
+                for s in trace.spans
+            ],
+            hide_index=True,
+        )
+
+
+# ---------- Tabs ----------
+
+def overview_tab(data: analytics.Dataset, spec: FilterSpec):
     st.markdown("### 📊 Overview – How Are Students Performing Overall?")
     st.markdown(
         "<p class='section-subtitle'>High-level summary of performance, attendance and learning styles.</p>",
         unsafe_allow_html=True,
     )
 
+    kpis = analytics.overview_kpis(data, spec)
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        metric_card("Total Students (Filtered)", f"{len(df):,}")
+        metric_card("Total Students (Filtered)", f"{kpis['students']:,}")
     with col2:
-        metric_card("Avg Exam Score", f"{df['ExamScore'].mean():.1f}")
+        metric_card("Avg Exam Score", f"{kpis['avg_exam_score']:.1f}")
     with col3:
-        metric_card("Avg Attendance (%)", f"{df['Attendance'].mean():.1f}")
+        metric_card("Avg Attendance (%)", f"{kpis['avg_attendance']:.1f}")
     with col4:
-        if "PerformanceCategory" in df.columns:
-            high_pct = (df["PerformanceCategory"] == "High").mean() * 100
-            metric_card("High Performers (%)", f"{high_pct:.1f} %")
+        if "high_performer_pct" in kpis:
+            metric_card("High Performers (%)", f"{kpis['high_performer_pct']:.1f} %")
 
     st.markdown("<div class='section-title'>Score Distribution</div>", unsafe_allow_html=True)
     st.markdown(
         "<p class='section-subtitle'>How are exam scores spread across students?</p>",
         unsafe_allow_html=True,
     )
-    fig_exam = px.histogram(
-        df,
-        x="ExamScore",
-        nbins=30,
-        title="Exam Score Distribution",
-    )
-    fig_exam.update_layout(template="plotly_white", bargap=0.05)
-    st.plotly_chart(fig_exam, use_container_width=True)
-    
-    if "PerformanceCategory" in df.columns:
+    plot(figures.exam_histogram_figure, data, spec)
+
+    if data.has("PerformanceCategory"):
         st.markdown("<div class='section-title'>Performance Categories</div>", unsafe_allow_html=True)
-        perf_counts = df["PerformanceCategory"].value_counts().reset_index()
-        perf_counts.columns = ["PerformanceCategory", "Count"]
-        fig_perf = px.bar(
-            perf_counts,
-            x="PerformanceCategory",
-            y="Count",
-            text="Count",
-            title="Students by Performance Category",
-        )
-        fig_perf.update_traces(textposition="outside")
-        fig_perf.update_layout(template="plotly_dark", xaxis_title="", yaxis_title="Number of Students")
-        st.plotly_chart(fig_perf, use_container_width=True)
+        plot(figures.performance_figure, data, spec, drill="PerformanceCategory")
 
     st.markdown("<div class='section-title'>Learning Styles Breakdown</div>", unsafe_allow_html=True)
     st.markdown(
         "<p class='section-subtitle'>Which learning preferences are most common in this group?</p>",
         unsafe_allow_html=True,
     )
-    ls_counts = df["LearningStyle"].value_counts().reset_index()
-    ls_counts.columns = ["LearningStyle", "Count"]
-    fig_ls = px.pie(
-        ls_counts,
-        names="LearningStyle",
-        values="Count",
-        title="Learning Style Distribution",
-        hole=0.4,
-    )
-    fig_ls.update_layout(template="plotly_dark")
-    st.plotly_chart(fig_ls, use_container_width=True)
+    plot(figures.learning_style_pie_figure, data, spec)
 
 
-def attendance_study_tab(df: pd.DataFrame):
+def attendance_study_tab(data: analytics.Dataset, spec: FilterSpec):
     st.markdown("### 🎯 Attendance & Study Habits – Where Is the Sweet Spot?")
     st.markdown(
         "<p class='section-subtitle'>Understand how attendance and study hours relate to exam performance.</p>",
@@ -321,59 +485,23 @@ def attendance_study_tab(df: pd.DataFrame):
             "<p class='section-subtitle'>Each point is a student. Higher to the right = better attendance, higher up = better score.</p>",
             unsafe_allow_html=True,
         )
-        color_col = "PerformanceCategory" if "PerformanceCategory" in df.columns else None
-        fig_att = px.scatter(
-            df,
-            x="Attendance",
-            y="ExamScore",
-            color=color_col,
-            title="Attendance vs Exam Score",
-            trendline="ols",
-        )
-        fig_att.update_layout(template="plotly_dark", xaxis_title="Attendance (%)", yaxis_title="Exam Score")
-        st.plotly_chart(fig_att, use_container_width=True)
+        plot(figures.attendance_scatter_figure, data, spec, drill="AttendanceBucket")
 
     with col2:
-        if "AttendanceBucket" in df.columns:
+        if data.has("AttendanceBucket"):
             st.markdown("<div class='section-title'>Average Score by Attendance Group</div>", unsafe_allow_html=True)
-            group_att = df.groupby("AttendanceBucket")["ExamScore"].mean().reset_index()
-            fig_att_bucket = px.bar(
-                group_att,
-                x="AttendanceBucket",
-                y="ExamScore",
-                title="Average Exam Score by Attendance Group",
-                text="ExamScore",
-            )
-            fig_att_bucket.update_traces(texttemplate="%{text:.1f}", textposition="outside")
-            fig_att_bucket.update_layout(
-                template="plotly_dark",
-                xaxis_title="Attendance Group",
-                yaxis_title="Average Exam Score",
-            )
-            st.plotly_chart(fig_att_bucket, use_container_width=True)
+            plot(figures.attendance_bucket_figure, data, spec, drill="AttendanceBucket")
 
     st.markdown("<div class='section-title'>Study Hours & Performance</div>", unsafe_allow_html=True)
     st.markdown(
         "<p class='section-subtitle'>Compare exam scores across different weekly study-hour ranges.</p>",
         unsafe_allow_html=True,
     )
-    if "StudyHoursBucket" in df.columns:
-        fig_study = px.box(
-            df,
-            x="StudyHoursBucket",
-            y="ExamScore",
-            points="all",
-            title="Exam Score by Study Hours Group",
-        )
-        fig_study.update_layout(
-            template="plotly_dark",
-            xaxis_title="Study Hours Group",
-            yaxis_title="Exam Score",
-        )
-        st.plotly_chart(fig_study, use_container_width=True)
+    if data.has("StudyHoursBucket"):
+        plot(figures.study_hours_figure, data, spec, drill="StudyHoursBucket")
 
 
-def learning_style_tab(df: pd.DataFrame):
+def learning_style_tab(data: analytics.Dataset, spec: FilterSpec):
     st.markdown("### 🧠 Learning Styles – Do They Really Matter?")
     st.markdown(
         "<p class='section-subtitle'>See how different learning preferences relate to performance and behavior.</p>",
@@ -384,44 +512,12 @@ def learning_style_tab(df: pd.DataFrame):
 
     with col1:
         st.markdown("<div class='section-title'>Average Exam Score by Learning Style</div>", unsafe_allow_html=True)
-        group_ls = df.groupby("LearningStyle")["ExamScore"].mean().reset_index()
-        fig_ls_score = px.bar(
-            group_ls,
-            x="LearningStyle",
-            y="ExamScore",
-            title="Average Exam Score by Learning Style",
-            text="ExamScore",
-        )
-        fig_ls_score.update_traces(texttemplate="%{text:.1f}", textposition="outside")
-        fig_ls_score.update_layout(
-            template="plotly_dark",
-            xaxis_title="Learning Style",
-            yaxis_title="Average Exam Score",
-        )
-        st.plotly_chart(fig_ls_score, use_container_width=True)
+        plot(figures.learning_style_score_figure, data, spec, drill="LearningStyle")
 
     with col2:
-        if "PerformanceCategory" in df.columns:
+        if data.has("PerformanceCategory"):
             st.markdown("<div class='section-title'>Performance Mix within Each Learning Style</div>", unsafe_allow_html=True)
-            perf_by_ls = (
-                df.groupby(["LearningStyle", "PerformanceCategory"])
-                .size()
-                .reset_index(name="Count")
-            )
-            fig_ls_perf = px.bar(
-                perf_by_ls,
-                x="LearningStyle",
-                y="Count",
-                color="PerformanceCategory",
-                title="Performance Categories by Learning Style",
-                barmode="stack",
-            )
-            fig_ls_perf.update_layout(
-                template="plotly_dark",
-                xaxis_title="Learning Style",
-                yaxis_title="Number of Students",
-            )
-            st.plotly_chart(fig_ls_perf, use_container_width=True)
+            plot(figures.learning_style_performance_figure, data, spec, drill="LearningStyle")
 
     # Engagement vs Learning style (e.g., StudyHours or Discussions)
     st.markdown("<div class='section-title'>Engagement Patterns by Learning Style</div>", unsafe_allow_html=True)
@@ -430,14 +526,7 @@ def learning_style_tab(df: pd.DataFrame):
         unsafe_allow_html=True,
     )
 
-    metrics = []
-    if "StudyHours" in df.columns:
-        metrics.append("StudyHours")
-    if "Discussions" in df.columns:
-        metrics.append("Discussions")
-    if "AssignmentCompletion" in df.columns:
-        metrics.append("AssignmentCompletion")
-
+    metrics = data.engagement_metrics()
     if metrics:
         metric_choice = st.selectbox(
             "Choose engagement metric",
@@ -445,24 +534,10 @@ def learning_style_tab(df: pd.DataFrame):
             index=0,
             help="Compare different engagement metrics across learning styles",
         )
-        group_eng = df.groupby("LearningStyle")[metric_choice].mean().reset_index()
-        fig_eng = px.bar(
-            group_eng,
-            x="LearningStyle",
-            y=metric_choice,
-            title=f"Average {metric_choice} by Learning Style",
-            text=metric_choice,
-        )
-        fig_eng.update_traces(texttemplate="%{text:.1f}", textposition="outside")
-        fig_eng.update_layout(
-            template="plotly_dark",
-            xaxis_title="Learning Style",
-            yaxis_title=f"Average {metric_choice}",
-        )
-        st.plotly_chart(fig_eng, use_container_width=True)
+        plot(figures.engagement_figure, data, spec, metric_choice, drill="LearningStyle")
 
 
-def stress_motivation_tab(df: pd.DataFrame):
+def stress_motivation_tab(data: analytics.Dataset, spec: FilterSpec):
     st.markdown("### ⚠ Stress & Motivation – The Hidden Factors")
     st.markdown(
         "<p class='section-subtitle'>Explore how stress and motivation are linked to performance.</p>",
@@ -473,39 +548,16 @@ def stress_motivation_tab(df: pd.DataFrame):
 
     with col1:
         st.markdown("<div class='section-title'>Stress vs Exam Score</div>", unsafe_allow_html=True)
-        fig_stress = px.scatter(
-            df,
-            x="StressLevel",
-            y="ExamScore",
-            color="PerformanceCategory" if "PerformanceCategory" in df.columns else None,
-            title="Stress Level vs Exam Score",
-        )
-        fig_stress.update_layout(
-            template="plotly_dark",
-            xaxis_title="Stress Level",
-            yaxis_title="Exam Score",
-        )
-        st.plotly_chart(fig_stress, use_container_width=True)
+        plot(figures.stress_scatter_figure, data, spec, drill="StressBucket")
 
     with col2:
         st.markdown("<div class='section-title'>Motivation vs Exam Score</div>", unsafe_allow_html=True)
-        fig_mot = px.scatter(
-            df,
-            x="Motivation",
-            y="ExamScore",
-            color="PerformanceCategory" if "PerformanceCategory" in df.columns else None,
-            title="Motivation vs Exam Score",
-        )
-        fig_mot.update_layout(
-            template="plotly_dark",
-            xaxis_title="Motivation Level",
-            yaxis_title="Exam Score",
-        )
-        st.plotly_chart(fig_mot, use_container_width=True)
+        plot(figures.motivation_scatter_figure, data, spec)
 
     st.markdown("<div class='section-title'>Average Stress & Motivation (Current View)</div>", unsafe_allow_html=True)
-    avg_stress = df["StressLevel"].mean()
-    avg_mot = df["Motivation"].mean()
+    summary = analytics.stress_motivation_summary(data, spec)
+    avg_stress = summary["avg_stress"]
+    avg_mot = summary["avg_motivation"]
     col_a, col_b = st.columns(2)
     with col_a:
         metric_card("Avg Stress Level", f"{avg_stress:.1f}")
@@ -514,148 +566,172 @@ def stress_motivation_tab(df: pd.DataFrame):
 
     st.markdown("<div class='section-title'>Interpretation & Suggestions</div>", unsafe_allow_html=True)
 
-    insights = []
-    if avg_stress >= 8:
-        insights.append("Stress levels are **high on average**. Consider providing counselling, stress-management workshops and flexible deadlines.")
-    elif avg_stress >= 5:
-        insights.append("Stress levels are **moderate**. Monitor during exam periods and offer support proactively.")
-    else:
-        insights.append("Average stress is **relatively low**, but individual students may still need support.")
+    for text in analytics.stress_motivation_insights(summary):
+        st.markdown(f"- {text}")
 
-    if avg_mot <= 4:
-        insights.append("Motivation appears **low**. Introduce goal-setting sessions, peer mentoring and more feedback on progress.")
-    elif avg_mot <= 7:
-        insights.append("Motivation is **moderate**. Small nudges like recognition, progress tracking and rewards can help.")
-    else:
-        insights.append("Motivation is **high on average**. Focus on maintaining engagement and providing challenging tasks.")
 
-    for text in insights:
-        st.markdown(f"- {text}")
+def drivers_tab(data: analytics.Dataset, spec: FilterSpec):
+    st.markdown("### 🔍 Drivers – What Moves the Outcome?")
+    st.markdown(
+        "<p class='section-subtitle'>How the numeric factors move together, and how strongly each one relates to the outcome when the others are held fixed.</p>",
+        unsafe_allow_html=True,
+    )
 
+    st.markdown("<div class='section-title'>Correlation Matrix (Current View)</div>", unsafe_allow_html=True)
+    plot(figures.correlation_heatmap_figure, data, spec)
+
+    targets = data.driver_targets()
+    if not targets:
+        return
+    target = st.selectbox(
+        "Choose outcome",
+        targets,
+        index=0,
+        help="Outcome whose drivers are ranked below",
+    )
+    st.markdown(f"<div class='section-title'>Effect Sizes on {target}</div>", unsafe_allow_html=True)
+    plot(figures.driver_effects_figure, data, spec, target)
+
+    effects = analytics.driver_effects(data, spec, target)
+    st.dataframe(
+        effects,
+        hide_index=True,
+        column_config={
+            "r": st.column_config.NumberColumn("r", help="Correlation with the outcome", format="%.3f"),
+            "r2": st.column_config.NumberColumn("r²", help="Share of the outcome's variance explained alone", format="%.3f"),
+            "slope": st.column_config.NumberColumn("Slope", help="Outcome change per unit of the factor", format="%.3f"),
+            "per_sd": st.column_config.NumberColumn("Per SD", help="Outcome change per standard deviation of the factor", format="%.2f"),
+            "beta": st.column_config.NumberColumn("β", help="Standardized effect with all other factors held fixed", format="%.3f"),
+        },
+    )
 
-def main():
+
+def filter_controls(options: dict) -> FilterSpec:
+    """Sidebar filters; inside a form (the default) they only rerun the app on "Apply"."""
+    batched = analytics.config.FILTER_FORM
+    with st.sidebar.form("filters", border=False) if batched else st.sidebar.container():
+        gender_options = [analytics.ALL] + options["gender"]
+        gender = st.selectbox("Gender", gender_options)
+
+        learning_options = [analytics.ALL] + options["learning_style"]
+        learning_style = st.selectbox("Learning Style", learning_options)
+
+        # Attendance filter (a slider needs a range: none for empty or single-valued data)
+        min_att, max_att = options["attendance"]
+        att_range = (min_att, max_att)
+        if min_att < max_att:
+            att_range = st.slider(
+                "Attendance (%)",
+                min_att,
+                max_att,
+                (min_att, max_att),
+            )
+        if batched:
+            st.form_submit_button("Apply filters", type="primary", use_container_width=True)
+
+    # Normalized so equivalent selections (e.g. the full attendance range) share cache entries
+    return FilterSpec(gender=gender, learning_style=learning_style, attendance=tuple(att_range)).normalized(
+        options["attendance"]
+    )
+
+
+def settle_filters(spec: FilterSpec) -> bool:
+    """Record the applied filters and report whether they changed since the last rerun.
+
+    Reruns with unchanged filters (section switches, refreshes) go straight to
+    the cached results. A change waits DASHBOARD_FILTER_DEBOUNCE_MS first: if
+    the user is still dragging, Streamlit interrupts this rerun at its next
+    call and only the last of a burst of changes does the work.
+    """
+    changed = st.session_state.get("applied_filters") != spec
+    if changed and analytics.config.FILTER_DEBOUNCE_MS:
+        with timing.span("debounce"):
+            time.sleep(analytics.config.FILTER_DEBOUNCE_MS / 1000)
+    st.session_state["applied_filters"] = spec
+    return changed
+
+
+SECTIONS = {
+    "📊 Overview": overview_tab,
+    "🎯 Attendance & Study Habits": attendance_study_tab,
+    "🧠 Learning Styles": learning_style_tab,
+    "⚠ Stress & Motivation": stress_motivation_tab,
+    "🔍 Drivers": drivers_tab,
+}
+
+
+def dashboard():
     st.set_page_config(
         page_title="Student Performance Analytics Dashboard",
         layout="wide",
     )
     add_light_minimal_theme()
-    df = load_data()
-
     # Sidebar filters – readable options
     st.sidebar.title("🎓 Filters")
 
-    gender_options = ["All"] + sorted(df["Gender"].dropna().unique().tolist())
-    gender = st.sidebar.selectbox("Gender", gender_options)
-
-    learning_options = ["All"] + sorted(df["LearningStyle"].dropna().unique().tolist())
-    learning_style = st.sidebar.selectbox("Learning Style", learning_options)
-
-    # Attendance filter
-    min_att, max_att = float(df["Attendance"].min()), float(df["Attendance"].max())
-    att_range = st.sidebar.slider(
-        "Attendance (%)",
-        min_att,
-        max_att,
-        (min_att, max_att),
-    )
+    cohorts = analytics.list_cohorts()
+    cohort = analytics.ALL
+    if cohorts:
+        cohort = st.sidebar.selectbox("Cohort", [analytics.ALL] + cohorts)
+    with timing.span("load_data", cohort=cohort) as span:
+        data = load_data(None if cohort == analytics.ALL else (cohort,))
+        options = data.options()
+        if timing.current():
+            span["rows_out"] = len(data)
+
+    spec = filter_controls(options)
+    filters_changed = settle_filters(spec)
+    trace = timing.current()
+    if trace:
+        with trace.span("filter", rows_in=len(data)) as span:
+            span["rows_out"] = data.count(spec)
+        trace.meta.update(
+            cohort=cohort,
+            gender=spec.gender,
+            learning_style=spec.learning_style,
+            attendance=spec.attendance,
+            filters_changed=filters_changed,
+        )
 
-    # Filter dataframe
-    filtered_df = df.copy()
-    if gender != "All":
-        filtered_df = filtered_df[filtered_df["Gender"] == gender]
-    if learning_style != "All":
-        filtered_df = filtered_df[filtered_df["LearningStyle"] == learning_style]
-    filtered_df = filtered_df[
-        (filtered_df["Attendance"] >= att_range[0]) &
-        (filtered_df["Attendance"] <= att_range[1])
-    ]
-
-        # Hero / banner
-    st.markdown(
-        """
-        <div class="hero-container">
-            <div>
-                <div class="hero-pill">
-                    🎓 Student Analytics • End-to-End
-                </div>
-                <div class="hero-left-title">
-                    Student Performance Analytics Dashboard
-                </div>
-                <div class="hero-left-subtitle">
-                    Analyze study habits, attendance, learning styles, stress and motivation
-                    to understand how they influence exam performance and final grades.
-                </div>
-                <div class="hero-tags">
-                    <span class="hero-tag">Study Hours</span>
-                    <span class="hero-tag">Attendance</span>
-                    <span class="hero-tag">Learning Styles</span>
-                    <span class="hero-tag">Stress</span>
-                    <span class="hero-tag">Motivation</span>
-                </div>
-            </div>
-            <div class="hero-right-card">
-                <div class="hero-right-header">
-                    <div class="hero-right-title">Current Cohort Snapshot</div>
-                    <div class="hero-right-badge">Live view</div>
-                </div>
-                <div class="hero-right-bars">
-                    <div class="hero-right-bar-row">
-                        <div class="hero-right-bar-label">Exam Score</div>
-                        <div class="hero-right-bar-track">
-                            <div class="hero-right-bar-fill" style="width: 72%;"></div>
-                        </div>
-                    </div>
-                    <div class="hero-right-bar-row">
-                        <div class="hero-right-bar-label">Attendance</div>
-                        <div class="hero-right-bar-track">
-                            <div class="hero-right-bar-fill" style="width: 84%;"></div>
-                        </div>
-                    </div>
-                    <div class="hero-right-bar-row">
-                        <div class="hero-right-bar-label">Motivation</div>
-                        <div class="hero-right-bar-track">
-                            <div class="hero-right-bar-fill" style="width: 65%;"></div>
-                        </div>
-                    </div>
-                </div>
-                <div class="hero-metrics-row">
-                    <div class="hero-metric-chip">
-                        <div class="hero-metric-label">Students</div>
-                        <div class="hero-metric-value">14,003</div>
-                    </div>
-                    <div class="hero-metric-chip">
-                        <div class="hero-metric-label">High performers</div>
-                        <div class="hero-metric-value">↑ data‑driven</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    # Hero / banner
+    with timing.span("hero"):
+        hero_banner(analytics.hero_snapshot(data, spec))
+    timing.STARTUP.mark("hero", RUN_START)
 
 
-    # Tabs for sections
-    tab1, tab2, tab3, tab4 = st.tabs(
-        [
-            "📊 Overview",
-            "🎯 Attendance & Study Habits",
-            "🧠 Learning Styles",
-            "⚠ Stress & Motivation",
-        ]
+    # Section picker instead of st.tabs: only the selected section's figures are built
+    section = st.segmented_control(
+        "Section",
+        list(SECTIONS),
+        default=next(iter(SECTIONS)),
+        required=True,
+        key="section",
+        label_visibility="collapsed",
     )
-
-    with tab1:
-        overview_tab(filtered_df)
-    with tab2:
-        attendance_study_tab(filtered_df)
-    with tab3:
-        learning_style_tab(filtered_df)
-    with tab4:
-        stress_motivation_tab(filtered_df)
+    if timing.current():
+        timing.current().meta["section"] = section
+    with timing.span(f"tab:{SECTIONS[section].__name__}"):
+        SECTIONS[section](data, spec)
+    with timing.span("drilldown"):
+        drilldown_panel(data, spec)
 
     st.markdown("---")
     st.caption("Built by B M Bharath • Student Performance Analytics Dashboard")
+    timing.STARTUP.mark("first_run", RUN_START)
+
+
+def main():
+    if not analytics.config.TIMING:
+        dashboard()
+    else:
+        with timing.Trace(ts=time.time()) as trace:
+            dashboard()
+        if FIRST_RUN:
+            trace.meta["startup"] = timing.STARTUP.to_dict()
+            logging.getLogger(__name__).info(timing.STARTUP.summary())
+        timing_panel(trace)
+        if analytics.config.TIMING_LOG:
+            trace.append_to(analytics.config.TIMING_LOG)
 
 
 if __name__ == "__main__":
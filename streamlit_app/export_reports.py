@@ -0,0 +1,169 @@
+"""Headless batch export of the dashboard's charts for every filter combination.
+
+For each cohort (one pack per school/term when the data is partitioned) and
+each Gender × Learning Style selection, including "All", the tabs'
+charts are built with the same builders the app uses (:mod:`figures`) and
+written as static files::
+
+    reports/<cohort>/<gender>_<learning-style>/<tab>.html   one page per tab
+    reports/<cohort>/<gender>_<learning-style>/<tab>.json   plotly figure JSON
+    reports/<cohort>/<gender>_<learning-style>/<tab>-<n>.png  with --formats png (needs kaleido)
+
+Combinations are spread over a process pool. Every worker keeps its loaded
+dataset, aggregate cube and per-filter metric results in the analytics
+caches, so combinations share them; on platforms that fork, the parent loads
+the unpartitioned dataset and builds its cube once before the pool starts and
+workers inherit it. HTML pages reference one shared ``plotly.min.js``.
+
+Run from the repository root::
+
+    python streamlit_app/export_reports.py [--out reports] [--formats html,json,png] [--workers N]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+from typing import Optional
+
+import analytics
+import figures
+from analytics import ALL, FilterSpec
+
+OUT_DIR = analytics.data.PROCESSED_DIR.parent / "reports"
+FORMATS = ("html", "json", "png")
+TAB_TITLES = {
+    "overview": "📊 Overview",
+    "attendance_study": "🎯 Attendance & Study Habits",
+    "learning_style": "🧠 Learning Styles",
+    "stress_motivation": "⚠ Stress & Motivation",
+    "drivers": "🔍 Drivers",
+}
+PLOTLY_JS = "plotly.min.js"
+
+# Per-worker settings, set by _init_worker
+_options = {}
+
+
+def slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", value).strip("-").lower() or "blank"
+
+
+def dataset(path: Optional[Path], cohort: Optional[str]) -> analytics.Dataset:
+    return analytics.cached_dataset(path, cohorts=[cohort] if cohort else None)
+
+
+def combinations(path: Optional[Path], cohorts: list) -> list:
+    """``(cohort, spec)`` tasks, grouped by cohort so each worker loads few datasets."""
+    tasks = []
+    for cohort in cohorts:
+        options = dataset(path, cohort).options()
+        genders = [ALL] + options["gender"]
+        styles = [ALL] + options["learning_style"]
+        tasks.extend((cohort, FilterSpec(gender, style)) for gender, style in product(genders, styles))
+    return tasks
+
+
+def _init_worker(options: dict):
+    _options.update(options)
+
+
+def _page(title: str, figs: list, plotlyjs: str) -> str:
+    divs = "\n".join(fig.to_html(full_html=False, include_plotlyjs=False) for fig in figs)
+    return (
+        f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{title}</title>'
+        f'<script src="{plotlyjs}"></script></head>\n<body>\n<h1>{title}</h1>\n{divs}\n</body></html>\n'
+    )
+
+
+def export_combination(cohort: Optional[str], spec: FilterSpec) -> dict:
+    """Write every tab's charts for one filter combination; returns its manifest entry."""
+    data = dataset(_options["path"], cohort)
+    out = _options["out"] / slug(cohort or "all") / f"{slug(spec.gender)}_{slug(spec.learning_style)}"
+    entry = {"cohort": cohort, "gender": spec.gender, "learning_style": spec.learning_style, "students": data.count(spec)}
+    if not entry["students"]:
+        return {**entry, "files": []}  # nothing to chart
+
+    out.mkdir(parents=True, exist_ok=True)
+    files = []
+    for tab, charts in figures.tab_figures(data).items():
+        figs = [builder(data, spec, *args) for builder, args in charts]
+        if "html" in _options["formats"]:
+            title = f"{TAB_TITLES[tab]} – {cohort or 'All cohorts'} · {spec.gender} · {spec.learning_style}"
+            plotlyjs = os.path.relpath(_options["out"] / PLOTLY_JS, out)
+            (out / f"{tab}.html").write_text(_page(title, figs, plotlyjs), encoding="utf-8")
+            files.append(f"{tab}.html")
+        if "json" in _options["formats"]:
+            (out / f"{tab}.json").write_text("[" + ",".join(fig.to_json() for fig in figs) + "]", encoding="utf-8")
+            files.append(f"{tab}.json")
+        if "png" in _options["formats"]:
+            for i, fig in enumerate(figs, 1):
+                fig.write_image(out / f"{tab}-{i}.png")
+                files.append(f"{tab}-{i}.png")
+    return {**entry, "path": str(out.relative_to(_options["out"])), "files": files}
+
+
+def run(
+    out: Path = OUT_DIR,
+    formats: tuple = ("html", "json"),
+    path: Optional[Path] = None,
+    cohorts: Optional[list] = None,
+    workers: Optional[int] = None,
+) -> list:
+    """Export every combination under ``out``; returns the manifest entries (also saved as ``manifest.json``)."""
+    path = path or analytics.data.default_data_path()
+    if cohorts is None:
+        cohorts = analytics.list_cohorts(path) if path.is_dir() else []
+    cohorts = cohorts or [None]
+    if "png" in formats and importlib.util.find_spec("kaleido") is None:
+        print("⚠ kaleido not installed – skipping png")
+        formats = tuple(f for f in formats if f != "png")
+
+    out.mkdir(parents=True, exist_ok=True)
+    if "html" in formats:
+        from plotly.offline import get_plotlyjs
+
+        (out / PLOTLY_JS).write_text(get_plotlyjs(), encoding="utf-8")
+    if cohorts == [None]:
+        _ = dataset(path, None).cube  # built here so forked workers inherit it
+
+    tasks = combinations(path, cohorts)
+    workers = workers or os.cpu_count() or 1
+    options = {"out": out, "formats": formats, "path": path}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as pool:
+        manifest = list(pool.map(
+            export_combination,
+            [cohort for cohort, _ in tasks],
+            [spec for _, spec in tasks],
+            chunksize=max(1, len(tasks) // (workers * 4)),
+        ))
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=1, default=str))
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export every tab's charts for each Gender × Learning Style combination.")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help="output directory")
+    parser.add_argument("--formats", default="html,json", help=f"comma-separated subset of {','.join(FORMATS)}")
+    parser.add_argument("--data", type=Path, default=None, help="processed Parquet file or partitioned directory (default: what the app loads)")
+    parser.add_argument("--cohort", action="append", default=None, help="only export this cohort (repeatable)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+
+    start = time.perf_counter()
+    manifest = run(args.out, formats, args.data, args.cohort, args.workers)
+    written = sum(len(entry["files"]) for entry in manifest)
+    print(f"✅ Exported {len(manifest):,} filter combinations ({written:,} files) in {time.perf_counter() - start:.1f} s to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Plotly figures for the dashboard's charts, independent of Streamlit.
+
+Each builder depends only on ``(data, spec, *args)``, so its output can be
+shared by every session looking at the same filters (the app caches it as
+JSON) and rendered headlessly (``export_reports.py``). :func:`tab_figures`
+lists the charts each tab shows, in page order.
+"""
+import plotly.express as px
+import plotly.graph_objects as go
+
+import analytics
+from analytics import FilterSpec
+
+
+def scatter_figure(data: analytics.Dataset, spec: FilterSpec, x: str, title: str, trendline: bool = False):
+    """Per-student scatter, or a binned density chart once the view is too large to ship."""
+    color_col = "PerformanceCategory" if data.has("PerformanceCategory") else None
+    if data.count(spec) > analytics.config.SCATTER_MAX_POINTS:
+        fig = px.scatter(
+            analytics.scatter_density(data, spec, x),
+            x=x,
+            y="ExamScore",
+            color=color_col,
+            size="Count",
+            size_max=18,
+            opacity=0.7,
+            title=f"{title} (binned)",
+        )
+    else:
+        fig = px.scatter(
+            analytics.scatter_points(data, spec, x),
+            x=x,
+            y="ExamScore",
+            color=color_col,
+            title=title,
+        )
+    if trendline:
+        add_trendlines(fig, analytics.attendance_trendlines(data, spec), color_col)
+    return fig
+
+
+def add_trendlines(fig, lines, color_col):
+    """Overlay precomputed OLS lines, colored like the matching scatter trace."""
+    trace_colors = {trace.name: trace.marker.color for trace in fig.data}
+    for _, line in lines.iterrows():
+        name = str(line[color_col]) if color_col else ""
+        fig.add_scatter(
+            x=[line["x0"], line["x1"]],
+            y=[line["y0"], line["y1"]],
+            mode="lines",
+            line={"color": trace_colors.get(name)},
+            name=f"{name} trend".strip(),
+            legendgroup=name,
+            showlegend=False,
+            hovertemplate=f"y = {line['slope']:.3f}·x + {line['intercept']:.2f}<extra></extra>",
+        )
+
+
+def box_figure(summary, x: str, title: str):
+    """Box plot drawn from precomputed quartiles, with outliers as sized markers."""
+    fig = go.Figure(
+        go.Box(
+            x=summary[x].astype(str),
+            q1=summary["q1"],
+            median=summary["median"],
+            q3=summary["q3"],
+            lowerfence=summary["lowerfence"],
+            upperfence=summary["upperfence"],
+            mean=summary["mean"],
+            name="ExamScore",
+            showlegend=False,
+        )
+    )
+    outliers = [
+        (bucket, value, count)
+        for bucket, points in zip(summary[x].astype(str), summary["outliers"])
+        for value, count in points
+    ]
+    if outliers:
+        buckets, values, counts = zip(*outliers)
+        fig.add_scatter(
+            x=buckets,
+            y=values,
+            mode="markers",
+            marker={"size": [min(4 + c, 16) for c in counts]},
+            customdata=counts,
+            hovertemplate="%{y} (%{customdata} students)<extra></extra>",
+            name="Outliers",
+            showlegend=False,
+        )
+    fig.update_layout(title=title)
+    return fig
+
+
+def exam_histogram_figure(data: analytics.Dataset, spec: FilterSpec):
+    hist = analytics.exam_score_histogram(data, spec, nbins=30)
+    fig = px.bar(
+        hist,
+        x=(hist["BinStart"] + hist["BinEnd"]) / 2,
+        y="Count",
+        title="Exam Score Distribution",
+    )
+    fig.update_layout(template="plotly_white", bargap=0.05, xaxis_title="ExamScore", yaxis_title="count")
+    return fig
+
+
+def performance_figure(data: analytics.Dataset, spec: FilterSpec):
+    fig = px.bar(
+        analytics.performance_counts(data, spec),
+        x="PerformanceCategory",
+        y="Count",
+        text="Count",
+        title="Students by Performance Category",
+    )
+    fig.update_traces(textposition="outside")
+    fig.update_layout(template="plotly_dark", xaxis_title="", yaxis_title="Number of Students")
+    return fig
+
+
+def learning_style_pie_figure(data: analytics.Dataset, spec: FilterSpec):
+    fig = px.pie(
+        analytics.learning_style_counts(data, spec),
+        names="LearningStyle",
+        values="Count",
+        title="Learning Style Distribution",
+        hole=0.4,
+    )
+    fig.update_layout(template="plotly_dark")
+    return fig
+
+
+def attendance_scatter_figure(data: analytics.Dataset, spec: FilterSpec):
+    fig = scatter_figure(data, spec, "Attendance", "Attendance vs Exam Score", trendline=True)
+    fig.update_layout(template="plotly_dark", xaxis_title="Attendance (%)", yaxis_title="Exam Score")
+    return fig
+
+
+def attendance_bucket_figure(data: analytics.Dataset, spec: FilterSpec):
+    fig = px.bar(
+        analytics.score_by_attendance_bucket(data, spec),
+        x="AttendanceBucket",
+        y="ExamScore",
+        title="Average Exam Score by Attendance Group",
+        text="ExamScore",
+    )
+    fig.update_traces(texttemplate="%{text:.1f}", textposition="outside")
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Attendance Group",
+        yaxis_title="Average Exam Score",
+    )
+    return fig
+
+
+def study_hours_figure(data: analytics.Dataset, spec: FilterSpec):
+    fig = box_figure(
+        analytics.score_by_study_hours(data, spec),
+        "StudyHoursBucket",
+        "Exam Score by Study Hours Group",
+    )
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Study Hours Group",
+        yaxis_title="Exam Score",
+    )
+    return fig
+
+
+def learning_style_score_figure(data: analytics.Dataset, spec: FilterSpec):
+    fig = px.bar(
+        analytics.score_by_learning_style(data, spec),
+        x="LearningStyle",
+        y="ExamScore",
+        title="Average Exam Score by Learning Style",
+        text="ExamScore",
+    )
+    fig.update_traces(texttemplate="%{text:.1f}", textposition="outside")
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Learning Style",
+        yaxis_title="Average Exam Score",
+    )
+    return fig
+
+
+def learning_style_performance_figure(data: analytics.Dataset, spec: FilterSpec):
+    fig = px.bar(
+        analytics.performance_by_learning_style(data, spec),
+        x="LearningStyle",
+        y="Count",
+        color="PerformanceCategory",
+        title="Performance Categories by Learning Style",
+        barmode="stack",
+    )
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Learning Style",
+        yaxis_title="Number of Students",
+    )
+    return fig
+
+
+def engagement_figure(data: analytics.Dataset, spec: FilterSpec, metric: str):
+    fig = px.bar(
+        analytics.engagement_by_learning_style(data, spec, metric),
+        x="LearningStyle",
+        y=metric,
+        title=f"Average {metric} by Learning Style",
+        text=metric,
+    )
+    fig.update_traces(texttemplate="%{text:.1f}", textposition="outside")
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Learning Style",
+        yaxis_title=f"Average {metric}",
+    )
+    return fig
+
+
+def stress_scatter_figure(data: analytics.Dataset, spec: FilterSpec):
+    fig = scatter_figure(data, spec, "StressLevel", "Stress Level vs Exam Score")
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Stress Level",
+        yaxis_title="Exam Score",
+    )
+    return fig
+
+
+def motivation_scatter_figure(data: analytics.Dataset, spec: FilterSpec):
+    fig = scatter_figure(data, spec, "Motivation", "Motivation vs Exam Score")
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Motivation Level",
+        yaxis_title="Exam Score",
+    )
+    return fig
+
+
+def correlation_heatmap_figure(data: analytics.Dataset, spec: FilterSpec):
+    corr = analytics.correlation_matrix(data, spec)
+    fig = px.imshow(
+        corr,
+        text_auto=".2f",
+        color_continuous_scale="RdBu",
+        zmin=-1,
+        zmax=1,
+        aspect="auto",
+        title="Correlation Matrix",
+    )
+    fig.update_layout(template="plotly_dark", coloraxis_colorbar_title="r")
+    return fig
+
+
+def driver_effects_figure(data: analytics.Dataset, spec: FilterSpec, target: str):
+    effects = analytics.driver_effects(data, spec, target)
+    fig = px.bar(
+        effects.iloc[::-1],
+        x="beta",
+        y="Feature",
+        orientation="h",
+        text="beta",
+        hover_data={"r": ":.3f", "per_sd": ":.2f", "beta": ":.3f"},
+        title=f"What Moves {target}? (standardized effect, others held fixed)",
+    )
+    fig.update_traces(texttemplate="%{text:.3f}", textposition="outside")
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Standardized effect (β)",
+        yaxis_title="",
+    )
+    return fig
+
+
+def tab_figures(data: analytics.Dataset) -> dict:
+    """``{tab: [(builder, args), ...]}``: the charts each dashboard tab draws for ``data``.
+
+    Mirrors the ``*_tab`` functions in ``app.py``; the engagement and driver
+    charts are listed once per option their tab's selectbox offers.
+    """
+    overview = [(exam_histogram_figure, ())]
+    if data.has("PerformanceCategory"):
+        overview.append((performance_figure, ()))
+    overview.append((learning_style_pie_figure, ()))
+
+    attendance_study = [(attendance_scatter_figure, ())]
+    if data.has("AttendanceBucket"):
+        attendance_study.append((attendance_bucket_figure, ()))
+    if data.has("StudyHoursBucket"):
+        attendance_study.append((study_hours_figure, ()))
+
+    learning_style = [(learning_style_score_figure, ())]
+    if data.has("PerformanceCategory"):
+        learning_style.append((learning_style_performance_figure, ()))
+    learning_style.extend((engagement_figure, (metric,)) for metric in data.engagement_metrics())
+
+    return {
+        "overview": overview,
+        "attendance_study": attendance_study,
+        "learning_style": learning_style,
+        "stress_motivation": [(stress_scatter_figure, ()), (motivation_scatter_figure, ())],
+        "drivers": [(correlation_heatmap_figure, ())]
+        + [(driver_effects_figure, (target,)) for target in data.driver_targets()],
+    }